@@ -3,6 +3,7 @@
 # using SQLAlchemy with connection pooling, session management, and enhanced error handling.
 
 import os  # Import os for accessing environment variables
+import json  # Import json as the fallback serializer for JSON/JSONB columns
 from sqlalchemy import create_engine  # Import create_engine to establish a PostgreSQL connection with SQLAlchemy
 from sqlalchemy.orm import sessionmaker  # Import sessionmaker for session management
 from sqlalchemy.engine import Engine  # Import Engine type for type hinting
@@ -10,6 +11,10 @@ from sqlalchemy.exc import OperationalError, SQLAlchemyError  # Import specific
 from dotenv import load_dotenv  # Import load_dotenv to load environment variables from a .env file
 from pathlib import Path  # Import Path for managing filesystem paths
 import logging  # Import logging to track database connection information and errors
+try:
+    import orjson  # Optional C JSON codec used for JSONB parameters; falls back to the json module
+except ImportError:
+    orjson = None
 
 # Configure logging to capture database connection information and errors
 logging.basicConfig(level=logging.INFO)  # Set log level to INFO for general logs
@@ -40,6 +45,22 @@ except Exception as e:  # Catch any other unexpected errors during URL construct
     logger.error(f"Unexpected error during PostgreSQL URL construction: {e}")  # Log the error
     raise RuntimeError("Unexpected error occurred while constructing PostgreSQL connection URL.") from e  # Raise descriptive error
 
+
+def _json_serializer(value) -> str:
+    """
+    Serializes JSON/JSONB bind parameters, using orjson when it is installed.
+
+    Args:
+        value: Python object bound to a JSON or JSONB column.
+
+    Returns:
+        str: JSON text sent to PostgreSQL.
+    """
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(value)
+
+
 # Initialize SQLAlchemy Engine with connection pooling and error handling
 try:
     engine: Engine = create_engine(
@@ -47,7 +68,12 @@ try:
         pool_size = int(os.getenv("PG_POOL_SIZE", 20)),  # Set max number of connections in the pool
         max_overflow = int(os.getenv("PG_MAX_OVERFLOW", 10)),  # Allow additional connections if the pool is full
         pool_timeout=int(os.getenv("PG_POOL_TIMEOUT", 30)),  # Wait timeout in seconds for a connection from the pool
-        pool_recycle=1800,  # Recycle connections every 30 minutes to prevent stale connections
+        pool_recycle=int(os.getenv("PG_POOL_RECYCLE", 1800)),  # Recycle connections every 30 minutes to prevent stale connections
+        pool_pre_ping=True,  # Check pooled connections on checkout so long-lived ones can be reused safely
+        executemany_mode="values_plus_batch",  # Send executemany INSERTs as multi-row VALUES and batch UPDATE/DELETE
+        insertmanyvalues_page_size=int(os.getenv("PG_INSERT_PAGE_SIZE", 1000)),  # Rows per multi-row INSERT page
+        executemany_batch_page_size=int(os.getenv("PG_BATCH_PAGE_SIZE", 500)),  # Statements per UPDATE/DELETE batch
+        json_serializer=_json_serializer,  # Serialize JSONB values (e.g. Characteristics) with orjson when available
         echo=os.getenv("DEBUG", "False").lower() == "true"  # Enable SQL query logging if DEBUG mode is enabled
     )
     logger.info("PostgreSQL Engine created successfully.")  # Log successful engine creation
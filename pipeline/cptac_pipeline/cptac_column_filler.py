@@ -96,6 +96,8 @@ class CptacColumnsFiller:
                     logger.warning("No entries found in the CptacMetadata table.")
                     return
 
+                # Collect one row per dataset and insert them together after the loop
+                column_rows = []
                 for metadata in metadata_entries:
                     try:
                         grouped_columns = self.get_cleaned_grouped_columns(metadata.data_type, metadata.source)
@@ -106,22 +108,25 @@ class CptacColumnsFiller:
                         # Serialize grouped columns to JSON string
                         column_data_json = json.dumps(grouped_columns)
 
-                        stmt = insert(CptacColumns).values(
-                            dataset_id=metadata.id,
-                            column_data=column_data_json,
-                            data_type=metadata.data_type,
-                            source=metadata.source,  # Include source field
-                            description=metadata.description,
-                        ).on_conflict_do_nothing()
-                        session.execute(stmt)
+                        column_rows.append({
+                            "dataset_id": metadata.id,
+                            "column_data": column_data_json,
+                            "data_type": metadata.data_type,
+                            "source": metadata.source,  # Include source field
+                            "description": metadata.description,
+                        })
 
                         self.hashmap.put(metadata.id, grouped_columns)
-                        logger.info(f"Inserted grouped columns for dataset ID {metadata.id} into CptacColumns table.")
 
                     except RuntimeError as e:
                         logger.error(f"Skipping dataset {metadata.id} due to error: {e}")
                         continue
 
+                # Insert all collected rows with one executemany upsert instead of one INSERT per dataset
+                if column_rows:
+                    session.execute(insert(CptacColumns).on_conflict_do_nothing(), column_rows)
+                    logger.info(f"Inserted grouped columns for {len(column_rows)} datasets into CptacColumns table.")
+
                 session.commit()
                 logger.info("CptacColumns table populated successfully.")
 
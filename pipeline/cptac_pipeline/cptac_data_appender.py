@@ -118,7 +118,9 @@ class CptacDataAppender:
 
                 # Check if this sample-protein pair already exists
                 if (sample_id, protein_name) in existing_pairs:
-                    logger.info(f"Sample {sample_id}, Protein {protein_name} already exists. Appending quantification.")
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("Sample %s, Protein %s already exists. Appending quantification.",
+                                     sample_id, protein_name)
                     session.execute(
                         text("""
                             UPDATE proteomics
@@ -4,7 +4,7 @@ import pandas as pd
 import logging
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.dialects.postgresql import insert
-from sqlalchemy import cast, func
+from sqlalchemy import cast, func, select
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Session
 from config.db_config import get_session_context
@@ -39,6 +39,8 @@ class CPTACDataIngestor:
             raise ValueError("Cancer dataset name must be provided.")
         self.cancer_dataset_name = cancer_dataset_name
         self.cancer_data = None
+        # Gene symbol -> mapper ID per mapping table, loaded once and extended as entries are created
+        self._mapper_ids = {}
 
     def load_dataset(self):
         """
@@ -99,8 +101,9 @@ class CPTACDataIngestor:
             logger.error(f"Unsupported data type for metadata extraction: {data_type}")
             raise ValueError(f"Unsupported data type: {data_type}")
 
-        # Log metadata structure for debugging
-        logger.debug(f"Metadata structure for {data_type} ({source}): {metadata.head()}")
+        # Log metadata structure for debugging; rendering the DataFrame is skipped unless DEBUG is on
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Metadata structure for %s (%s): %s", data_type, source, metadata.head())
 
         # Extract quantification data (skip metadata rows)
         quantification_data = df.iloc[len(metadata.columns):, :].copy()
@@ -125,8 +128,10 @@ class CPTACDataIngestor:
         # Drop rows with missing metadata or quantifications
         final_df.dropna(subset=["Name", "quantification"], inplace=True)
 
-        # Log final DataFrame structure
-        logger.info(f"Preprocessed {data_type} ({source}) DataFrame structure: {final_df.head()}")
+        # Log the final DataFrame size; its preview is only rendered at DEBUG level
+        logger.info("Preprocessed %s (%s) DataFrame: %d rows.", data_type, source, len(final_df))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Preprocessed %s (%s) DataFrame structure: %s", data_type, source, final_df.head())
         return final_df
 
     def get_relevant_metadata_entry(self, session, data_type: str) -> CptacMetadata:
@@ -169,19 +174,25 @@ class CPTACDataIngestor:
         Preload existing SampleIDs from the CptacMetadataLog for a specific data type and source.
         """
         try:
-            existing_samples = session.query(CptacMetadataLog.SampleID).filter_by(
-                DataType=data_type,
-                Source=source,
-                Status="uploaded"
-            ).all()
-            return {sample[0] for sample in existing_samples}
+            # scalars() yields the SampleID values directly instead of one Row per sample
+            return set(session.scalars(
+                select(CptacMetadataLog.SampleID).filter_by(
+                    DataType=data_type,
+                    Source=source,
+                    Status="uploaded"
+                )
+            ))
         except Exception as e:
             logger.error(f"Failed to preload SampleIDs: {e}")
             return set()
 
-    def log_cptac_upload(self, session, sample_id, data_type, source, status, message=None):
+    def log_cptac_upload(self, session, sample_id, data_type, source, status, message=None, commit=True):
         """
         Logs the status of CPTAC data upload for a specific sample.
+
+        With commit=False the log entry is only added to the session, so the caller can
+        commit it together with the uploaded data. Errors are then re-raised instead of
+        rolled back, leaving the caller's transaction for the caller to handle.
         """
         try:
             log_entry = CptacMetadataLog(
@@ -192,9 +203,12 @@ class CPTACDataIngestor:
                 Message=message
             )
             session.add(log_entry)
-            session.commit()
+            if commit:
+                session.commit()
         except Exception as e:
             logger.error(f"Failed to log upload for sample {sample_id}: {e}")
+            if not commit:
+                raise
             session.rollback()
 
     def upload_proteomics_data(
@@ -255,17 +269,17 @@ class CPTACDataIngestor:
                 logger.warning(f"No data to insert for proteomics sample {sample_id}. Skipping.")
                 return
 
-            # Bulk insert and commit
+            # Bulk insert, log the successful upload, and commit both in one transaction
             session.bulk_save_objects(batch)
+            self.log_cptac_upload(session, sample_id, metadata_entry.data_type, metadata_entry.source, "uploaded",
+                                  commit=False)
             session.commit()
-
-            # Log successful upload
-            self.log_cptac_upload(session, sample_id, metadata_entry.data_type, metadata_entry.source, "uploaded")
             logger.info(f"Proteomics data for sample {sample_id} successfully uploaded.")
 
         except Exception as e:
-            # Log failed upload
+            # Discard the uncommitted data batch, then log the failed upload
             logger.error(f"Failed to upload proteomics data for sample {sample_id}: {e}")
+            session.rollback()
             self.log_cptac_upload(session, sample_id, metadata_entry.data_type, metadata_entry.source, "failed", str(e))
 
     def upload_phosphoproteomics_data(
@@ -332,17 +346,17 @@ class CPTACDataIngestor:
                 logger.warning(f"No data to insert for phosphoproteomics sample {sample_id}. Skipping.")
                 return
 
-            # Bulk insert and commit
+            # Bulk insert, log the successful upload, and commit both in one transaction
             session.bulk_save_objects(batch)
+            self.log_cptac_upload(session, sample_id, metadata_entry.data_type, metadata_entry.source, "uploaded",
+                                  commit=False)
             session.commit()
-
-            # Log successful upload
-            self.log_cptac_upload(session, sample_id, metadata_entry.data_type, metadata_entry.source, "uploaded")
             logger.info(f"Phosphoproteomics data for sample {sample_id} successfully uploaded.")
 
         except Exception as e:
-            # Log failed upload
+            # Discard the uncommitted data batch, then log the failed upload
             logger.error(f"Failed to upload phosphoproteomics data for sample {sample_id}: {e}")
+            session.rollback()
             self.log_cptac_upload(session, sample_id, metadata_entry.data_type, metadata_entry.source, "failed", str(e))
 
     def upload_transcriptomics_data(
@@ -403,23 +417,25 @@ class CPTACDataIngestor:
                 logger.warning(f"No data to insert for transcriptomics sample {sample_id}. Skipping.")
                 return
 
-            # Bulk insert and commit
+            # Bulk insert, log the successful upload, and commit both in one transaction
             session.bulk_save_objects(batch)
+            self.log_cptac_upload(session, sample_id, metadata_entry.data_type, metadata_entry.source, "uploaded",
+                                  commit=False)
             session.commit()
-
-            # Log successful upload
-            self.log_cptac_upload(session, sample_id, metadata_entry.data_type, metadata_entry.source, "uploaded")
             logger.info(f"Transcriptomics data for sample {sample_id} successfully uploaded.")
 
         except Exception as e:
-            # Log failed upload
+            # Discard the uncommitted data batch, then log the failed upload
             logger.error(f"Failed to upload transcriptomics data for sample {sample_id}: {e}")
+            session.rollback()
             self.log_cptac_upload(session, sample_id, metadata_entry.data_type, metadata_entry.source, "failed", str(e))
 
     def get_mapper_id(self, session: Session, mapper_table, feature: str) -> int:
         """
         Retrieves or creates a mapper ID for a given feature.
 
+        Existing mapper IDs are loaded once per mapping table and cached on the ingestor.
+
         Args:
             session (Session): Database session.
             mapper_table: ORM model for the mapping table.
@@ -448,10 +464,17 @@ class CPTACDataIngestor:
             else:
                 gene_symbol = feature  # Treat entire feature as gene_symbol if no delimiter is present
 
+            # Load every existing gene symbol -> ID pair with one query on first use, instead of
+            # querying the mapping table once per feature row
+            mapper_ids = self._mapper_ids.get(mapper_table)
+            if mapper_ids is None:
+                mapper_ids = dict(session.execute(select(mapper_table.gene_symbol, mapper_table.id)).tuples())
+                self._mapper_ids[mapper_table] = mapper_ids
+
             # Check if the mapper entry already exists
-            mapper_entry = session.query(mapper_table).filter(mapper_table.gene_symbol == gene_symbol).first()
-            if mapper_entry:
-                return mapper_entry.id
+            mapper_id = mapper_ids.get(gene_symbol)
+            if mapper_id is not None:
+                return mapper_id
 
             # Create a new mapper entry
             new_mapper_entry = mapper_table(
@@ -463,6 +486,8 @@ class CPTACDataIngestor:
             session.add(new_mapper_entry)
             session.commit()
 
+            # Remember the new entry so later rows with the same gene symbol skip the insert
+            mapper_ids[gene_symbol] = new_mapper_entry.id
             return new_mapper_entry.id
 
         except Exception as e:
@@ -188,6 +188,10 @@ class CptacMetadataExtractor:
         """
         Upload extracted metadata entries to the database with conflict resolution.
 
+        All entries are written in one transaction that is committed once at the end;
+        each entry runs in its own savepoint so a failing entry is skipped without
+        discarding the others.
+
         Args:
             metadata_entries (list[dict]): A list of metadata entries to upload.
         """
@@ -218,19 +222,21 @@ class CptacMetadataExtractor:
                         preview_features=entry["feature_names"],
                     ).on_conflict_do_nothing()  # Skip insertion if conflict occurs
 
-                    # Execute the statement and commit
-                    session.execute(stmt)
-                    session.commit()
+                    # Execute the statement inside a savepoint so a failing entry is rolled
+                    # back on its own without ending the surrounding transaction
+                    with session.begin_nested():
+                        session.execute(stmt)
                     logger.info(f"Uploaded metadata for {entry['data_type']} - {entry['source']}, "
                                 f"or skipped if it already exists.")
                 except (IntegrityError, DataError, SQLAlchemyError) as e:
-                    # Handle database-specific errors, log them, and roll back the transaction
+                    # Handle database-specific errors and log them; the savepoint is already rolled back
                     logger.error(f"Database error for '{entry['data_type']}' - '{entry['source']}': {e}")
-                    session.rollback()
                 except Exception as e:
-                    # Handle unexpected errors, log them, and roll back the transaction
+                    # Handle unexpected errors and log them
                     logger.error(f"Unexpected error during upload: {e}")
-                    session.rollback()
+
+            # Commit all uploaded entries in a single transaction
+            session.commit()
         logger.info("Database upload complete.")
 
 
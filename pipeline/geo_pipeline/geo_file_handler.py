@@ -82,19 +82,24 @@ class GeoFileHandler:
             # Log the initialization process
             self.logger.info(f"Initializing log table for {len(geo_ids)} GEO IDs.")
 
-            # Insert GEO IDs into the database log table
+            # Build one log entry per GEO ID; the shared date is computed once
+            today = date.today()
+            log_entries = [
+                {
+                    "GeoID": geo_id,
+                    "Status": "not_downloaded",
+                    "Message": "Pending download.",
+                    "FileNames": [],
+                    "Timestamp": today,
+                }
+                for geo_id in geo_ids
+            ]
+
+            # Insert all GEO IDs with a single executemany upsert; SQLAlchemy sends the
+            # rows as batched multi-row INSERTs instead of one statement per GEO ID
             with get_session_context() as session:
-                for geo_id in geo_ids:
-                    log_entry = {
-                        "GeoID": geo_id,
-                        "Status": "not_downloaded",
-                        "Message": "Pending download.",
-                        "FileNames": [],
-                        "Timestamp": date.today(),
-                    }
-                    # Use an upsert query to avoid duplicates
-                    insert_query = insert(GeoMetadataLog).values(log_entry).on_conflict_do_nothing()
-                    session.execute(insert_query)
+                insert_query = insert(GeoMetadataLog).on_conflict_do_nothing()
+                session.execute(insert_query, log_entries)
                 session.commit()
 
             # Log successful completion of the initialization process
@@ -3,8 +3,20 @@ import logging
 import os
 import json
 import re
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
 from lxml import etree
-from typing import Dict, Optional
+try:
+    import orjson  # Optional C JSON codec; the standard library json module is used without it
+except ImportError:
+    orjson = None
+try:
+    import pyarrow  # Columnar output of `extract_samples_to_table`
+except ImportError:
+    pyarrow = None
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple, Union
+from sqlalchemy import select
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import SQLAlchemyError
@@ -13,6 +25,254 @@ from db.schema.geo_metadata_schema import GeoSeriesMetadata, GeoSampleMetadata
 from config.logger_config import configure_logger
 from pipeline.geo_pipeline.geo_file_handler import GeoFileHandler  # Import GeoFileHandler
 
+# Namespace map used by the MINiML field templates (e.g. "geo:Title")
+MINIML_NAMESPACES = {'geo': 'http://www.ncbi.nlm.nih.gov/geo/info/MINiML'}
+
+# Clark-notation tags of the two record types streamed out of a MINiML family file
+SERIES_TAG = '{http://www.ncbi.nlm.nih.gov/geo/info/MINiML}Series'
+SAMPLE_TAG = '{http://www.ncbi.nlm.nih.gov/geo/info/MINiML}Sample'
+
+
+@lru_cache(maxsize=4096)
+def _compile_xpath(path: str, namespaces: Tuple[Tuple[str, str], ...]) -> etree.XPath:
+    """
+    Compiles an XPath expression once per process and shares it across GeoMetadataETL instances.
+
+    The pipeline builds one ETL object per MINiML file, so caching at module level keeps
+    the same template paths from being recompiled for every file.
+
+    Args:
+        path (str): XPath expression taken from the field template.
+        namespaces (Tuple[Tuple[str, str], ...]): Hashable (prefix, URI) pairs for the expression.
+
+    Returns:
+        etree.XPath: Compiled XPath object returning plain strings for text and attribute results.
+    """
+    return etree.XPath(path, namespaces=dict(namespaces), smart_strings=False)
+
+
+# Parser options for streaming MINiML records: indentation-only text and comments are never
+# referenced by the field templates, so they are dropped instead of being kept in the record subtree.
+# huge_tree lifts libxml2's 10 MB text-node limit, which long Summary/Data-Processing blocks can hit,
+# collect_ids=False skips building an ID hash table that nothing looks up, and resolve_entities=False
+# leaves the DTD entity machinery (unused by MINiML) switched off.
+ITERPARSE_OPTIONS = {'remove_blank_text': True, 'remove_comments': True, 'huge_tree': True, 'collect_ids': False,
+                     'resolve_entities': False}
+
+# GEO Series accession (e.g. "GSE12345"); bound once so per-file checks skip the re module cache
+IS_SERIES_ACCESSION = re.compile(r'GSE\d+').fullmatch
+
+# Matches one location step that selects a child element, e.g. "geo:Title"
+CHILD_STEP_PATTERN = re.compile(r'^(?:([A-Za-z_][\w.-]*):)?([A-Za-z_][\w.-]*)$')
+
+
+@lru_cache(maxsize=4096)
+def _child_steps(path: str, namespaces: Tuple[Tuple[str, str], ...]) -> Optional[Tuple[str, ...]]:
+    """
+    Resolves a child-only template path to the Clark-notation tags of its location steps.
+
+    Paths such as "geo:Channel/geo:Source" become ("{uri}Channel", "{uri}Source"); anything
+    using axes, predicates, functions or attributes is left to the compiled XPath.
+
+    Args:
+        path (str): XPath expression taken from the field template.
+        namespaces (Tuple[Tuple[str, str], ...]): Hashable (prefix, URI) pairs for the expression.
+
+    Returns:
+        Optional[Tuple[str, ...]]: One tag per step, or None if the path is not a plain child path.
+    """
+    namespace_map = dict(namespaces)
+    tags = []
+    for step in path.split("/"):
+        match = CHILD_STEP_PATTERN.match(step)
+        if not match:
+            return None
+        prefix, local_name = match.groups()
+        if prefix is None:
+            tags.append(local_name)
+            continue
+        uri = namespace_map.get(prefix)
+        if not uri:
+            return None
+        tags.append(f"{{{uri}}}{local_name}")
+    return tuple(tags)
+
+
+def _first_value(results: list) -> Optional[str]:
+    """Returns the first XPath string result (e.g. an attribute value), or None."""
+    if not results:
+        return None
+    value = results[0]
+    return _canonical_text(value) if isinstance(value, str) else value
+
+
+def _first_text(results: list) -> Optional[str]:
+    """
+    Returns the stripped text of the first matched element, or None if it has no text.
+
+    Low-cardinality fields (Organism, Molecule, LibraryStrategy, ...) repeat across Samples,
+    so short values are interned.
+    """
+    sub_elem = results[0] if results else None
+    return _canonical_text(sub_elem.text.strip()) if sub_elem is not None and sub_elem.text else None
+
+
+# Longest field value that is interned; longer values are free text and rarely repeat
+CANONICAL_TEXT_MAX_LENGTH = 64
+
+
+def _canonical_text(text: str) -> str:
+    """Interns short strings so repeated values share one object; longer strings are returned as-is."""
+    return sys.intern(text) if len(text) < CANONICAL_TEXT_MAX_LENGTH else text
+
+
+def _characteristics(results: list) -> list:
+    """
+    Converts Characteristics elements into {"tag", "value"} dictionaries.
+
+    The same few tag names (e.g. "tissue", "age") and short values (e.g. "Homo sapiens",
+    "tumor") repeat across every Sample of a study, so they are interned to share one
+    string object.
+    """
+    return [
+        {"tag": sys.intern(char.attrib.get("tag", "Unknown")), "value": _canonical_text((char.text or "").strip())}
+        for char in results
+    ]
+
+
+def _relations(results: list) -> list:
+    """Converts Relation elements into {"type", "target"} dictionaries for JSON compatibility."""
+    return [
+        {"type": sys.intern(rel.attrib.get("type", "Unknown")), "target": rel.attrib.get("target", "")}
+        for rel in results
+    ]
+
+
+def _select_converter(field_name: str, path: str) -> Callable[[list], object]:
+    """
+    Picks how the matches of a template path are turned into a field value.
+
+    Args:
+        field_name (str): Name of the template field.
+        path (str): XPath expression taken from the field template.
+
+    Returns:
+        Callable[[list], object]: Converter applied to the matched nodes or strings.
+    """
+    if "@" in path:  # Attribute-based fields
+        return _first_value
+    if field_name == "Characteristics":  # Multiple characteristics
+        return _characteristics
+    if field_name == "RelatedDatasets":  # List of relations
+        return _relations
+    return _first_text  # Default behavior for other fields
+
+
+# Fields whose absence is reported as a validation failure
+REQUIRED_FIELDS = frozenset({'SeriesID', 'SampleID'})
+
+# Fields a Sample record must carry before it is inserted; see `_validate_sample_data`
+SAMPLE_REQUIRED_FIELDS = ('SampleID', 'SeriesID', 'Title')
+
+# Number of Sample rows sent per multi-row INSERT while streaming a family file
+SAMPLE_INSERT_BATCH_SIZE = 500
+
+# One (field name, path, child steps, compiled XPath, converter, required) entry per template field;
+# see `_build_field_plan`
+FieldPlan = Tuple[Tuple[str, str, Optional[Tuple[str, ...]], Optional[etree.XPath], Callable[[list], object], bool], ...]
+
+
+def _build_field_plan(field_paths: Dict[str, str], namespaces: Tuple[Tuple[str, str], ...]) -> FieldPlan:
+    """
+    Freezes a template section into the per-field entries iterated by `_extract_fields`.
+
+    Child-only paths carry their resolved tag steps; every other path carries its compiled XPath,
+    so extraction calls it directly instead of looking it up in the cache for each record. The
+    value converter and the required flag are also chosen here, once per field, rather than
+    re-deciding them for every record.
+
+    Args:
+        field_paths (Dict[str, str]): Dictionary mapping field names to XML paths.
+        namespaces (Tuple[Tuple[str, str], ...]): Hashable (prefix, URI) pairs for the paths.
+
+    Returns:
+        FieldPlan: One entry per field, in template order.
+    """
+    plan = []
+    for field_name, path in field_paths.items():
+        child_steps = _child_steps(path, namespaces)
+        xpath = None
+        if child_steps is None:
+            try:
+                xpath = _compile_xpath(path, namespaces)
+            except etree.XPathSyntaxError:
+                # Left unresolved; `_compile_template` rejects it, `_extract_fields` reports it per field
+                xpath = None
+        # Field names become the keys of every extracted record; interning them shares
+        # one key object across all records and instances
+        plan.append((sys.intern(field_name), path, child_steps, xpath,
+                     _select_converter(field_name, path), field_name in REQUIRED_FIELDS))
+    return tuple(plan)
+
+
+def _dumps_json_line(value: Dict) -> bytes:
+    """
+    Serializes one NDJSON line, using orjson's C encoder when it is installed.
+
+    Args:
+        value (Dict): JSON-compatible record.
+
+    Returns:
+        bytes: UTF-8 JSON text terminated by a newline.
+    """
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(value) + "\n").encode("utf-8")
+
+
+# Per-process state of extract_many workers, set by `_init_extract_worker`
+_worker_template_path: Optional[str] = None
+_worker_extractor: Optional["GeoMetadataETL"] = None
+_worker_logger: Optional[logging.Logger] = None
+
+
+def _init_extract_worker(template_path: str) -> None:
+    """
+    Pool initializer for GeoMetadataETL.extract_many; records the template used by this worker.
+
+    Args:
+        template_path (str): Path to the JSON field mapping template.
+    """
+    global _worker_template_path, _worker_extractor, _worker_logger
+    _worker_template_path = template_path
+    _worker_extractor = None
+    # Workers log to the console only; several processes rotating geo_metadata_etl.log would
+    # interleave and drop lines. A separate logger name also avoids file handlers inherited on fork.
+    _worker_logger = configure_logger(
+        name="GeoMetadataETLWorker",
+        level=logging.INFO,
+        output="console"
+    )
+
+
+def _extract_file(file_path: str) -> Dict[str, object]:
+    """
+    Worker entry point for GeoMetadataETL.extract_many; runs in a child process.
+
+    The first file builds the worker's extractor, which later files reuse.
+
+    Args:
+        file_path (str): Path to the GEO XML file.
+
+    Returns:
+        Dict[str, object]: Extracted Series and Sample metadata for the file.
+    """
+    global _worker_extractor
+    if _worker_extractor is None:
+        _worker_extractor = GeoMetadataETL(file_path, _worker_template_path, file_handler=None,
+                                           logger=_worker_logger)
+    return _worker_extractor.extract_metadata(file_path)
+
 
 class GeoMetadataETL:
     """
@@ -23,16 +283,24 @@ class GeoMetadataETL:
     validate the extracted metadata, and insert it into a PostgreSQL database.
     """
     # ------------------ Initialization and Configuration ---------------------------------------------------------------
-    def __init__(self, file_path: str, template_path: str, file_handler: GeoFileHandler, debug_mode: bool = False) -> None:
+    def __init__(self, file_path: Union[str, os.PathLike], template_path: Union[str, os.PathLike],
+                 file_handler: GeoFileHandler, debug_mode: bool = False, strict_validate: bool = False,
+                 logger: Optional[logging.Logger] = None) -> None:
         """
         Initializes the GeoMetadataETL with file paths, logging settings, and a file handler.
 
         Args:
-            file_path (str): Path to the GEO XML file.
-            template_path (str): Path to the JSON field mapping template.
+            file_path (Union[str, os.PathLike]): Path to the GEO XML file.
+            template_path (Union[str, os.PathLike]): Path to the JSON field mapping template.
             file_handler (GeoFileHandler): Handles logging and file-related operations.
             debug_mode (bool): Enables detailed debug logging.
+            strict_validate (bool): Checks that the whole XML file is well-formed before streaming it.
+            logger (Optional[logging.Logger]): Logger instance to use (default: centralized ETL file logger).
         """
+        # Normalize path-like inputs once; later steps use string methods such as endswith()
+        file_path = os.fspath(file_path)
+        template_path = os.fspath(template_path)
+
         # Ensure the XML file exists and is a valid file
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"XML file not found: {file_path}")
@@ -53,10 +321,11 @@ class GeoMetadataETL:
         self.file_path = file_path
         self.template_path = template_path
         self.debug_mode = debug_mode
+        self.strict_validate = strict_validate
         self.file_handler = file_handler  # Assign the file handler instance
 
-        # Configure the logger using the centralized configuration
-        self.logger = configure_logger(
+        # Configure the logger using the centralized configuration unless one is provided
+        self.logger = logger or configure_logger(
             name="GeoMetadataETL",  # Unique name for this component
             log_file="geo_metadata_etl.log",  # Log file specific to this ETL process
             level=logging.DEBUG if debug_mode else logging.INFO,  # Set level based on debug flag
@@ -66,6 +335,9 @@ class GeoMetadataETL:
         # Load the JSON template for XML field mappings
         self.template = self._load_template()
 
+        # Compile every template path up front so invalid paths fail fast and extraction hits the cache
+        self._compile_template(self.template)
+
     def _load_template(self) -> Dict[str, Dict[str, str]]:
         """
         Loads the JSON template for XML field mappings.
@@ -79,31 +351,82 @@ class GeoMetadataETL:
             OSError: If the template file cannot be read.
         """
         try:
-            with open(self.template_path, 'r') as f:
-                template = json.load(f)
-
-                # Validate required keys in the template
-                required_keys = ['Series', 'Sample']
-                missing_keys = [key for key in required_keys if key not in template]
-                if missing_keys:
-                    raise KeyError(f"Missing required keys in template: {', '.join(missing_keys)}")
-
-                return template
+            return self._read_template(self.template_path)
         except (KeyError, json.JSONDecodeError, OSError) as e:
             self.logger.error(f"Failed to load template: {e}")
             raise
 
+    @staticmethod
+    def _read_template(template_path: str) -> Dict[str, Dict[str, str]]:
+        """
+        Reads and validates a JSON field mapping template without needing an ETL instance.
+
+        Args:
+            template_path (str): Path to the JSON template file.
+
+        Returns:
+            Dict[str, Dict[str, str]]: Parsed JSON template for field mappings.
+
+        Raises:
+            KeyError: If required keys are missing in the template.
+            json.JSONDecodeError: If the template is not valid JSON.
+            OSError: If the template file cannot be read.
+        """
+        with open(template_path, 'rb') as f:
+            # orjson raises a json.JSONDecodeError subclass, so both decoders fail the same way
+            template = orjson.loads(f.read()) if orjson is not None else json.load(f)
+
+        # Validate required keys in the template
+        required_keys = ['Series', 'Sample']
+        missing_keys = [key for key in required_keys if key not in template]
+        if missing_keys:
+            raise KeyError(f"Missing required keys in template: {', '.join(missing_keys)}")
+
+        return template
+
+    def _compile_template(self, template: Dict[str, Dict[str, str]]) -> None:
+        """
+        Compiles the XPath expressions of the Series and Sample sections of the template.
+
+        Each section is frozen into a field plan that the per-record extraction iterates directly;
+        building the plan compiles every XPath once, and any path it could not compile is rejected here.
+
+        Args:
+            template (Dict[str, Dict[str, str]]): Parsed JSON template for field mappings.
+
+        Raises:
+            etree.XPathSyntaxError: If a template path is not a valid XPath expression.
+        """
+        self._ns_key = tuple(sorted(MINIML_NAMESPACES.items()))
+        self._field_plans = {}
+        for section in ('Series', 'Sample'):
+            field_paths = template.get(section)
+            if not isinstance(field_paths, dict):
+                continue
+            # Freeze the section once so per-record extraction does not rebuild it
+            field_plan = _build_field_plan(field_paths, self._ns_key)
+            for field_name, path, child_steps, xpath, _, _ in field_plan:
+                if child_steps is None and xpath is None:
+                    self.logger.error(f"Invalid XPath for field '{field_name}' in {section} template: {path}")
+                    # Recompile the rejected path to raise its syntax error
+                    _compile_xpath(path, self._ns_key)
+            self._field_plans[section] = field_plan
+
     # ------------------------------- Validation ------------------------------------
     def _validate_xml(self) -> None:
         """
         Validates that the XML file is well-formed.
 
+        The file is streamed with `iterparse` and each element is released as soon as it
+        is closed, so validation runs in constant memory regardless of the file size.
+
         Raises:
             RuntimeError: If the XML structure is invalid.
         """
         try:
-            # Parse the XML to ensure it is well-formed
-            etree.parse(self.file_path)
+            # Stream the XML to ensure it is well-formed without materializing the full tree
+            for _, elem in etree.iterparse(self.file_path, events=("end",), **ITERPARSE_OPTIONS):
+                self._release_element(elem)
             self.logger.info("XML structure validated successfully.")
         except etree.XMLSyntaxError as e:
             self.logger.error(f"Invalid XML structure: {e}")
@@ -113,13 +436,46 @@ class GeoMetadataETL:
             raise RuntimeError("Failed to validate XML file.") from e
 
     # ----------------------------- Parsing and Extraction -----------------------------------
-    def _extract_fields(self, element: etree._Element, field_paths: Dict[str, str], ns: Dict[str, str]) -> Dict:
+    @staticmethod
+    def _release_element(elem: etree._Element) -> None:
+        """
+        Frees a fully processed element and the already processed siblings preceding it.
+
+        Args:
+            elem (etree._Element): Element whose end event has just been handled.
+        """
+        elem.clear()
+        # Drop preceding siblings so the root does not accumulate empty elements; the root itself
+        # has no parent, and its top-level siblings (processing instructions, comments) stay put
+        while elem.getparent() is not None and elem.getprevious() is not None:
+            del elem.getparent()[0]
+
+    @staticmethod
+    def _bucket_children(element: etree._Element) -> Dict[str, list]:
+        """
+        Groups the direct child elements of an XML element by tag, preserving document order.
+
+        Args:
+            element (etree._Element): XML element whose children are grouped.
+
+        Returns:
+            Dict[str, list]: Mapping of Clark-notation tag to the child elements with that tag.
+        """
+        children = {}
+        for child in element.iterchildren(tag=etree.Element):
+            children.setdefault(child.tag, []).append(child)
+        return children
+
+    def _extract_fields(self, element: etree._Element,
+                        field_paths: Union[Dict[str, str], FieldPlan],
+                        ns: Dict[str, str]) -> Dict:
         """
         Extracts fields from an XML element based on field paths.
 
         Args:
             element (etree._Element): XML element to extract data from.
-            field_paths (Dict[str, str]): Dictionary mapping field names to XML paths.
+            field_paths (Union[Dict[str, str], FieldPlan]): Dictionary mapping field names to XML paths,
+                or a field plan precomputed by `_compile_template`.
             ns (Dict[str, str]): Namespace dictionary for XML.
 
         Returns:
@@ -130,36 +486,44 @@ class GeoMetadataETL:
             raise ValueError("Namespace dictionary must be a valid dictionary.")
 
         data = {}
-        for field_name, path in field_paths.items():
+        ns_key = self._ns_key if ns == MINIML_NAMESPACES else tuple(sorted(ns.items()))
+        field_plan = _build_field_plan(field_paths, ns_key) if isinstance(field_paths, dict) else field_paths
+
+        # Bucket the direct children by tag in a single pass; most template paths select one of them
+        children = self._bucket_children(element)
+
+        # Child buckets of intermediate elements (e.g. Channel, Status), shared by every path below them
+        nested = {}
+
+        for field_name, path, child_steps, xpath, convert, required in field_plan:
             try:
-                if "@" in path:  # Handle attribute-based fields
-                    attribute_value = element.xpath(path, namespaces=ns)
-                    data[field_name] = attribute_value[0] if attribute_value else None
-                elif field_name == "Characteristics":  # Handle multiple characteristics
-                    characteristics = [
-                        {"tag": char.attrib.get("tag", "Unknown"), "value": (char.text or "").strip()}
-                        for char in element.findall(path, namespaces=ns)
-                    ]
-                    data[field_name] = characteristics
-                elif field_name == "RelatedDatasets":  # Handle as list of dictionaries for JSON compatibility
-                    relations = [
-                        {"type": rel.attrib.get("type", "Unknown"), "target": rel.attrib.get("target", "")}
-                        for rel in element.findall(path, namespaces=ns)
-                    ]
-                    data[field_name] = relations
-                else:  # Default behavior for other fields
-                    sub_elem = element.find(path, namespaces=ns)
-                    data[field_name] = sub_elem.text.strip() if sub_elem is not None and sub_elem.text else None
-
-                # Validate required fields
-                if field_name in ['SeriesID', 'SampleID'] and not data[field_name]:
-                    raise ValueError(f"Critical field '{field_name}' is missing.")
-
-            except ValueError as ve:
-                self.logger.error(f"Validation failed for field '{field_name}': {ve}")
-                data[field_name] = None
+                if child_steps is not None:
+                    # Walk the child steps like a tag trie, bucketing each intermediate element only once
+                    results = children.get(child_steps[0], [])
+                    for tag in child_steps[1:]:
+                        matched = []
+                        for node in results:
+                            node_children = nested.get(node)
+                            if node_children is None:
+                                node_children = nested[node] = self._bucket_children(node)
+                            matched.extend(node_children.get(tag, ()))
+                        results = matched
+                elif xpath is not None:
+                    # Call the XPath compiled when the plan was built
+                    results = xpath(element)
+                else:
+                    # Unresolved at plan time; compiling here raises the syntax error for this field
+                    results = _compile_xpath(path, ns_key)(element)
+
+                data[field_name] = value = convert(results)
             except Exception as e:
                 self.logger.warning(f"Error extracting field '{field_name}' at path '{path}': {e}")
+                data[field_name] = value = None
+
+            # Validate required fields; a missing ID is logged directly rather than raised and caught
+            if required and not value:
+                self.logger.error(f"Validation failed for field '{field_name}': "
+                                  f"Critical field '{field_name}' is missing.")
                 data[field_name] = None
         return data
 
@@ -187,15 +551,16 @@ class GeoMetadataETL:
 
         try:
             # Extract fields using the defined template
-            data = self._extract_fields(series_elem, self.template['Series'], ns)
+            data = self._extract_fields(series_elem, self._field_plans['Series'], ns)
 
             # Validate the extracted data
             if not data or 'SeriesID' not in data:
                 self.logger.error(f"Validation failed for Series data: {data}")
                 return None
 
-            # Log the extracted data for debugging purposes
-            self.logger.debug(f"Extracted Series data: {data}")
+            # Log the extracted data for debugging purposes; the guard skips formatting the record at INFO
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Extracted Series data: %s", data)
             return data
         except KeyError as e:
             self.logger.error(f"Template key error while processing Series: {e}")
@@ -233,7 +598,7 @@ class GeoMetadataETL:
 
         try:
             # Extract fields using the defined template for Samples
-            data = self._extract_fields(sample_elem, self.template['Sample'], ns)
+            data = self._extract_fields(sample_elem, self._field_plans['Sample'], ns)
 
             # Inherit SeriesID from the parent Series
             data['SeriesID'] = series_id
@@ -243,8 +608,9 @@ class GeoMetadataETL:
                 self.logger.error(f"Validation failed for Sample data: {data}")
                 return None
 
-            # Log the extracted and validated data for debugging purposes
-            self.logger.debug(f"Extracted and validated Sample data: {data}")
+            # Log the extracted and validated data for debugging purposes; runs once per Sample, so guard it
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Extracted and validated Sample data: %s", data)
             return data
         except KeyError as e:
             self.logger.error(f"Template key error while processing Sample: {e}")
@@ -278,7 +644,7 @@ class GeoMetadataETL:
 
         try:
             # Log the pre-insertion attempt
-            self.logger.debug(f"Attempting to pre-insert SeriesID: {series_id}")
+            self.logger.debug("Attempting to pre-insert SeriesID: %s", series_id)
 
             # Prepare the insert query
             insert_query = insert(GeoSeriesMetadata).values({"SeriesID": series_id}).on_conflict_do_nothing()
@@ -326,7 +692,7 @@ class GeoMetadataETL:
 
         try:
             # Log the update attempt
-            self.logger.debug(f"Updating SampleCount for SeriesID {series_id} to {sample_count}")
+            self.logger.debug("Updating SampleCount for SeriesID %s to %s", series_id, sample_count)
 
             # Prepare the upsert query to update the sample count
             update_query = (
@@ -369,7 +735,8 @@ class GeoMetadataETL:
             2. Initialize Database Session:
                 - Set up the PostgreSQL engine and database session for interactions.
             3. Validate XML Structure:
-                - Check if the XML file is well-formed and log any syntax errors.
+                - With `strict_validate`, check that the XML file is well-formed before any database
+                  writes. Otherwise syntax errors surface from the streaming pass in step 7.
             4. Ensure SeriesID in Database:
                 - Insert the SeriesID into the database if it does not already exist.
             5. Fetch Existing Samples:
@@ -378,6 +745,7 @@ class GeoMetadataETL:
                 - Use `iterparse` for efficient, memory-safe processing of XML elements.
             7. Process XML Elements:
                 - Parse and insert metadata for Series and Sample elements into the database.
+                - Queue new Samples and insert them in batches of `SAMPLE_INSERT_BATCH_SIZE` rows.
                 - Handle missing or invalid metadata with fallbacks or logs.
             8. Update SampleCount:
                 - Update the count of associated samples for the SeriesID in the database.
@@ -407,7 +775,7 @@ class GeoMetadataETL:
         inferred_series_id = base_name.split("_")[0] if base_name else None  # Get SeriesID from the filename.
 
         # Validate that the inferred SeriesID matches the expected format (e.g., "GSE12345").
-        if not inferred_series_id or not re.match(r'^GSE\d+$', inferred_series_id):
+        if not inferred_series_id or not IS_SERIES_ACCESSION(inferred_series_id):
             # Log an error if the SeriesID is invalid.
             self.logger.error(f"Failed to infer a valid SeriesID from filename: {base_name}")
             return 0  # Skip processing and return zero new samples.
@@ -432,7 +800,7 @@ class GeoMetadataETL:
             raise RuntimeError("Database initialization failed.") from e
 
         # Define the XML namespace for MINiML files.
-        ns = {'geo': 'http://www.ncbi.nlm.nih.gov/geo/info/MINiML'}
+        ns = MINIML_NAMESPACES
 
         # Initialize a counter for new samples processed during this run.
         new_sample_count = 0
@@ -440,9 +808,11 @@ class GeoMetadataETL:
         # ------------------- Step 3: Validate XML Structure -------------------
 
         try:
-            # Validate that the XML file is well-formed.
-            self._validate_xml()
-            self.logger.info("XML structure validated.")  # Log successful validation.
+            # A separate well-formedness pass re-reads the whole file; the streaming pass below
+            # reports the same syntax errors, so only run it when strict validation is requested.
+            if self.strict_validate:
+                self._validate_xml()
+                self.logger.info("XML structure validated.")  # Log successful validation.
 
             # ------------------- Step 4: Ensure SeriesID in Database -------------------
 
@@ -461,9 +831,10 @@ class GeoMetadataETL:
 
             try:
                 # Fetch all existing samples for the SeriesID to avoid duplicate uploads.
-                existing_samples = session.query(GeoSampleMetadata.SampleID).filter_by(
-                    SeriesID=inferred_series_id).all()
-                uploaded_samples = set(sample[0] for sample in existing_samples)  # Convert to a set for fast lookups.
+                # scalars() yields the SampleID strings directly instead of one Row per sample.
+                uploaded_samples = set(session.scalars(
+                    select(GeoSampleMetadata.SampleID).where(GeoSampleMetadata.SeriesID == inferred_series_id)
+                ))  # Collect into a set for fast lookups.
             except SQLAlchemyError as e:
                 # Log any errors related to fetching existing samples.
                 self.logger.error(f"Error fetching existing samples for SeriesID {inferred_series_id}: {e}")
@@ -474,9 +845,9 @@ class GeoMetadataETL:
             try:
                 # Create an XML iterparse context for efficient streaming of elements.
                 context = etree.iterparse(
-                    self.file_path, events=("start", "end"),
-                    tag=["{http://www.ncbi.nlm.nih.gov/geo/info/MINiML}Series",
-                         "{http://www.ncbi.nlm.nih.gov/geo/info/MINiML}Sample"]
+                    self.file_path, events=("end",),
+                    tag=(SERIES_TAG, SAMPLE_TAG),
+                    **ITERPARSE_OPTIONS
                 )
             except Exception as e:
                 # Log and raise an error if XML parsing cannot be initialized.
@@ -485,8 +856,12 @@ class GeoMetadataETL:
 
             # ------------------- Step 7: Process XML Elements -------------------
 
-            for event, elem in context:
-                if event == "end" and elem.tag.endswith("Series"):
+            # New Sample rows waiting to be inserted, and their SampleIDs.
+            pending_samples = []
+            pending_ids = set()
+
+            for _, elem in context:
+                if elem.tag == SERIES_TAG:
                     # Process the Series element and extract metadata.
                     series_data = self._process_series_data(elem, ns)
 
@@ -508,35 +883,32 @@ class GeoMetadataETL:
                         self.logger.error(f"Failed to insert Series {inferred_series_id}: {e}")
 
                     # Clear memory for the processed element to avoid memory leaks.
-                    elem.clear()
-                    while elem.getparent() is not None:
-                        del elem.getparent()[0]
+                    self._release_element(elem)
 
-                elif event == "end" and elem.tag.endswith("Sample"):
+                elif elem.tag == SAMPLE_TAG:
                     # Process the Sample element and extract metadata.
                     sample_data = self._process_sample_data(elem, ns, inferred_series_id)
 
                     # Extract the SampleID from the metadata.
                     sample_id = sample_data.get("SampleID") if sample_data else None
 
-                    # Avoid re-uploading samples that already exist in the database.
-                    if sample_id and sample_id not in uploaded_samples:
-                        try:
-                            # Insert new Sample metadata into the database.
-                            result = session.execute(
-                                insert(GeoSampleMetadata).values(sample_data).on_conflict_do_nothing()
-                            )
-                            if result.rowcount > 0:  # If a new row was inserted.
-                                uploaded_samples.add(sample_id)  # Add the SampleID to the uploaded set.
-                                new_sample_count += 1  # Increment the new sample counter.
-                        except SQLAlchemyError as e:
-                            # Log database errors for Sample insertion.
-                            self.logger.error(f"Failed to insert Sample {sample_id}: {e}")
+                    # Avoid re-uploading samples that already exist in the database or are already queued.
+                    if sample_id and sample_id not in uploaded_samples and sample_id not in pending_ids:
+                        pending_samples.append(sample_data)
+                        pending_ids.add(sample_id)
+
+                        # Send a full batch as one multi-row INSERT instead of one round trip per sample.
+                        if len(pending_samples) >= SAMPLE_INSERT_BATCH_SIZE:
+                            new_sample_count += self._flush_sample_batch(session, pending_samples, uploaded_samples)
+                            pending_samples = []
+                            pending_ids.clear()
 
                     # Clear memory for the processed element to avoid memory leaks.
-                    elem.clear()
-                    while elem.getparent() is not None:
-                        del elem.getparent()[0]
+                    self._release_element(elem)
+
+            # Insert whatever is left of the last partial batch.
+            if pending_samples:
+                new_sample_count += self._flush_sample_batch(session, pending_samples, uploaded_samples)
 
             # ------------------- Step 8: Update SampleCount -------------------
 
@@ -566,6 +938,11 @@ class GeoMetadataETL:
             # Log the successful completion of the ETL process.
             self.logger.info("Metadata streaming completed successfully.")
 
+        except etree.XMLSyntaxError as e:
+            # Malformed XML is reported by the streaming pass itself at the point of failure.
+            session.rollback()
+            self.logger.error(f"Invalid XML structure in {self.file_path}: {e}")
+            raise RuntimeError("Invalid XML structure.") from e
         except Exception as e:
             # Roll back changes in case of an error during processing.
             session.rollback()
@@ -581,6 +958,181 @@ class GeoMetadataETL:
         # Return the total number of new samples processed during this run.
         return new_sample_count
 
+    def iter_records(self, file_path: Optional[str] = None) -> Iterator[Tuple[str, Dict]]:
+        """
+        Streams Series and Sample records from the XML file without touching the database.
+
+        Each record is yielded as soon as its element closes, and the element is released
+        right after, so memory use stays flat regardless of how many Samples the file holds.
+
+        Args:
+            file_path (Optional[str]): MINiML file to read instead of the one this extractor was
+                created for; lets one extractor (and its loaded template) serve many files.
+
+        Yields:
+            Tuple[str, Dict]: ("Series", record) or ("Sample", record), in document order.
+
+        Raises:
+            RuntimeError: If the XML file cannot be parsed.
+        """
+        file_path = self.file_path if file_path is None else os.fspath(file_path)
+
+        # Infer the SeriesID from the filename, mirroring parse_and_stream.
+        base_name = os.path.basename(file_path)
+        series_id = base_name.split("_")[0] if base_name else None
+        ns = MINIML_NAMESPACES
+
+        try:
+            context = etree.iterparse(
+                file_path, events=("end",),
+                tag=(SERIES_TAG, SAMPLE_TAG),
+                **ITERPARSE_OPTIONS
+            )
+            for _, elem in context:
+                if elem.tag == SERIES_TAG:
+                    series_data = self._process_series_data(elem, ns) or {}
+                    series_data["SeriesID"] = series_id
+                    yield "Series", series_data
+                elif elem.tag == SAMPLE_TAG:
+                    sample_data = self._process_sample_data(elem, ns, series_id)
+                    if sample_data:
+                        yield "Sample", sample_data
+
+                # Clear memory for the processed element to avoid memory leaks.
+                self._release_element(elem)
+        except etree.XMLSyntaxError as e:
+            self.logger.error(f"Error parsing XML file {file_path}: {e}")
+            raise RuntimeError("Invalid XML structure.") from e
+
+    def extract_metadata(self, file_path: Optional[str] = None) -> Dict[str, object]:
+        """
+        Extracts Series and Sample metadata from the XML file without touching the database.
+
+        Uses the same streaming parse and field template as parse_and_stream, so the
+        records match what would be uploaded. Use `iter_records` or `export_ndjson` when
+        the Samples should not all be held in memory.
+
+        Args:
+            file_path (Optional[str]): MINiML file to read instead of the one this extractor was
+                created for.
+
+        Returns:
+            Dict[str, object]: {"Series": Optional[Dict], "Samples": List[Dict]} for the file.
+
+        Raises:
+            RuntimeError: If the XML file cannot be parsed.
+        """
+        metadata = {"Series": None, "Samples": []}
+        for record_type, record in self.iter_records(file_path):
+            if record_type == "Series":
+                metadata["Series"] = record
+            else:
+                metadata["Samples"].append(record)
+        return metadata
+
+    def export_ndjson(self, output_path: Union[str, os.PathLike], file_path: Optional[str] = None) -> int:
+        """
+        Writes the Series and Sample records of the XML file to a newline-delimited JSON file.
+
+        Records are written as they are parsed, one {"type": ..., "record": ...} object per line,
+        so the export runs in constant memory.
+
+        Args:
+            output_path (Union[str, os.PathLike]): Destination .ndjson file.
+            file_path (Optional[str]): MINiML file to read instead of the one this extractor was
+                created for.
+
+        Returns:
+            int: Number of records written.
+
+        Raises:
+            RuntimeError: If the XML file cannot be parsed.
+            OSError: If the output file cannot be written.
+        """
+        record_count = 0
+        with open(output_path, 'wb') as f:
+            for record_type, record in self.iter_records(file_path):
+                f.write(_dumps_json_line({"type": record_type, "record": record}))
+                record_count += 1
+        self.logger.info(f"Exported {record_count} records to {os.fspath(output_path)}")
+        return record_count
+
+    @classmethod
+    def extract_many(cls, file_paths: Iterable[str], template_path: str,
+                     max_workers: Optional[int] = None) -> Iterator[Tuple[str, Dict[str, object]]]:
+        """
+        Extracts metadata from many MINiML files in parallel worker processes.
+
+        Only file paths are sent to the workers. Each worker receives the template path once
+        through the pool initializer and keeps a single extractor for all the files it handles,
+        so the template is loaded and compiled once per process and nothing lxml-backed is
+        pickled. Results are yielded as soon as each file finishes, not in input order.
+
+        Args:
+            file_paths (Iterable[str]): Paths to the GEO XML files.
+            template_path (str): Path to the JSON field mapping template.
+            max_workers (Optional[int]): Number of worker processes (defaults to the CPU count).
+
+        Yields:
+            Tuple[str, Dict[str, object]]: The file path and its extracted metadata.
+
+        Raises:
+            RuntimeError: If extraction fails for any file.
+        """
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_extract_worker,
+                                 initargs=(template_path,)) as executor:
+            futures = {executor.submit(_extract_file, path): path for path in file_paths}
+            for future in as_completed(futures):
+                path = futures[future]
+                try:
+                    yield path, future.result()
+                except Exception as e:
+                    raise RuntimeError(f"Metadata extraction failed for {path}.") from e
+
+    @classmethod
+    def extract_samples_to_table(cls, file_paths: Iterable[str], template_path: str,
+                                 max_workers: Optional[int] = None) -> "pyarrow.Table":
+        """
+        Collects the Sample metadata of many MINiML files into one columnar Arrow table.
+
+        Values are appended to one list per field as each file completes, and each list becomes
+        one Arrow array, so no per-sample row objects are built. Missing values are Arrow nulls;
+        fields that are missing in every Sample are typed as strings. The table can be handed
+        straight to `pyarrow.parquet.write_table` or converted with `to_pandas()`.
+
+        Args:
+            file_paths (Iterable[str]): Paths to the GEO XML files.
+            template_path (str): Path to the JSON field mapping template.
+            max_workers (Optional[int]): Number of worker processes (defaults to the CPU count).
+
+        Returns:
+            pyarrow.Table: One row per Sample, with the template's Sample fields plus SeriesID as columns.
+
+        Raises:
+            ImportError: If pyarrow is not installed.
+            KeyError: If required keys are missing in the template.
+            RuntimeError: If extraction fails for any file.
+        """
+        if pyarrow is None:
+            raise ImportError("pyarrow is required to build the Sample metadata table.")
+
+        field_names = list(cls._read_template(template_path)['Sample'])
+        if 'SeriesID' not in field_names:
+            field_names.append('SeriesID')
+
+        columns = {field_name: [] for field_name in field_names}
+        for _, metadata in cls.extract_many(file_paths, template_path, max_workers=max_workers):
+            for sample in metadata["Samples"]:
+                for field_name, values in columns.items():
+                    values.append(sample.get(field_name))
+
+        arrays = []
+        for values in columns.values():
+            array = pyarrow.array(values)
+            # An all-null column infers the null type; keep it a nullable string column instead
+            arrays.append(array.cast(pyarrow.string()) if pyarrow.types.is_null(array.type) else array)
+        return pyarrow.Table.from_arrays(arrays, names=field_names)
+
     # ------------------- Helper Functions ----------------------------------------------
     def _validate_sample_data(self, sample_data: Dict) -> bool:
         """
@@ -596,16 +1148,13 @@ class GeoMetadataETL:
         Returns:
             bool: True if all required fields are present, False otherwise.
         """
-        # Define the required fields for a valid Sample record.
-        required_fields = ['SampleID', 'SeriesID', 'Title']
-
         # Check if sample_data is None or not a dictionary.
         if not isinstance(sample_data, dict):
             self.logger.error("Invalid sample_data provided: Must be a dictionary.")
             return False
 
         # Iterate over each required field to check if it exists in sample_data.
-        for field in required_fields:
+        for field in SAMPLE_REQUIRED_FIELDS:
             # If the field is missing or empty, log an error and return False.
             if not sample_data.get(field):
                 self.logger.error(f"Sample validation failed: Missing or empty field '{field}'")
@@ -692,3 +1241,58 @@ class GeoMetadataETL:
             self.logger.error(f"Unexpected error during Sample streaming: {e}")
             raise
 
+    def _flush_sample_batch(self, session, batch: list, uploaded_samples: set) -> int:
+        """
+        Inserts a batch of Sample metadata with a single multi-row INSERT.
+
+        Rows that already exist are skipped by ON CONFLICT DO NOTHING; the RETURNING
+        clause reports which SampleIDs were actually inserted. The insert runs inside a
+        SAVEPOINT so a failed batch is rolled back without aborting the session's transaction,
+        and is then retried one row at a time so only the offending rows are lost.
+
+        Args:
+            session: SQLAlchemy session object for database operations.
+            batch (list): Sample metadata dictionaries sharing the same keys.
+            uploaded_samples (set): SampleIDs known to be in the database; updated in place.
+
+        Returns:
+            int: The number of new Sample rows inserted.
+        """
+        try:
+            with session.begin_nested():
+                inserted = self._insert_samples(session, batch)
+        except SQLAlchemyError as e:
+            # The savepoint has been rolled back; fall back to per-row inserts to isolate the bad rows.
+            self.logger.warning(f"Batch insert of {len(batch)} Samples "
+                                f"({batch[0].get('SampleID')} .. {batch[-1].get('SampleID')}) failed, "
+                                f"retrying row by row: {e}")
+            inserted = []
+            for sample_data in batch:
+                try:
+                    with session.begin_nested():
+                        inserted.extend(self._insert_samples(session, [sample_data]))
+                except SQLAlchemyError as row_error:
+                    self.logger.error(f"Failed to insert Sample {sample_data.get('SampleID')}: {row_error}")
+
+        uploaded_samples.update(inserted)
+        return len(inserted)
+
+    @staticmethod
+    def _insert_samples(session, rows: list) -> list:
+        """
+        Runs one multi-row INSERT .. ON CONFLICT DO NOTHING for the given Sample rows.
+
+        Args:
+            session: SQLAlchemy session object for database operations.
+            rows (list): Sample metadata dictionaries sharing the same keys.
+
+        Returns:
+            list: SampleIDs of the rows that were actually inserted.
+        """
+        insert_query = (
+            insert(GeoSampleMetadata)
+            .values(rows)
+            .on_conflict_do_nothing()
+            .returning(GeoSampleMetadata.SampleID)
+        )
+        return session.execute(insert_query).scalars().all()
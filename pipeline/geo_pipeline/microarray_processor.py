@@ -1,8 +1,18 @@
+import io
 import os
 import zipfile
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Iterator, Tuple
 import pandas as pd
+try:
+    import pyarrow  # Optional multithreaded CSV reader; pandas' C parser is used without it
+except ImportError:
+    pyarrow = None
+from sqlalchemy import select, text
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
+from psycopg2 import Error as Psycopg2Error  # Raised by COPY, which bypasses SQLAlchemy
 from config.db_config import get_session_context
 from db.schema.microarray_schema import PlatformAnnotation, MicroarrayData
 import logging
@@ -16,6 +26,24 @@ logger = configure_logger(
     output="both"
 )
 
+# PlatformAnnotation columns loaded by COPY, and the temporary table they are staged in
+PLATFORM_COPY_COLUMNS = ("ProbeID", "GeneSymbol", "Description")
+PLATFORM_STAGE_TABLE = "_stage_platform_annotation"
+
+# MicroarrayData columns loaded by COPY; the serial id is filled in by PostgreSQL
+MICROARRAY_COPY_COLUMNS = ("SampleID", "SeriesID", "ProbeID", "ExpressionValue")
+
+# Column types for GSM files: probe IDs stay text so numeric-looking IDs match PlatformAnnotation,
+# and expression values keep double precision to match the Float column
+GSM_DTYPES = {"ProbeID": str, "ExpressionValue": "float64"}
+
+# pandas parser for GSM files: Arrow's tokenizer releases the GIL, so reader threads overlap
+GSM_CSV_ENGINE = "pyarrow" if pyarrow is not None else "c"
+
+# Threads reading GSM files, and how many files may be read ahead of the database writer
+GSM_READ_WORKERS = 4
+GSM_READ_AHEAD = 8
+
 
 class SimplifiedMicroarrayProcessor:
     """
@@ -48,6 +76,7 @@ class SimplifiedMicroarrayProcessor:
                 header=None,
                 usecols=[0, 1, 2],
                 names=["ProbeID", "GeneSymbol", "Description"],
+                dtype={"ProbeID": str},  # Keep numeric-looking probe IDs as text
             )
             logger.info(f"Loaded GPL file with {len(gpl_df)} rows.")
             return gpl_df
@@ -63,18 +92,26 @@ class SimplifiedMicroarrayProcessor:
             gpl_df (pd.DataFrame): DataFrame containing platform annotations.
         """
         try:
-            data_batch = [
-                PlatformAnnotation(
-                    ProbeID=row["ProbeID"],
-                    GeneSymbol=row["GeneSymbol"],
-                    Description=row["Description"],
-                )
-                for _, row in gpl_df.iterrows()
-            ]
-            self.session.bulk_save_objects(data_batch)
-            self.session.commit()
-            logger.info(f"Successfully inserted {len(data_batch)} rows into PlatformAnnotation.")
-        except SQLAlchemyError as e:
+            column_list = ", ".join(f'"{column}"' for column in PLATFORM_COPY_COLUMNS)
+
+            # Stage the annotations in a temporary table that is dropped when the series commits
+            self.session.execute(text(
+                f"CREATE TEMP TABLE IF NOT EXISTS {PLATFORM_STAGE_TABLE} "
+                f"(LIKE {PlatformAnnotation.__tablename__} INCLUDING DEFAULTS) ON COMMIT DROP"
+            ))
+            self.session.execute(text(f"TRUNCATE {PLATFORM_STAGE_TABLE}"))
+
+            # COPY the whole GPL table in one stream; missing annotations become NULL
+            self._copy_rows(PLATFORM_STAGE_TABLE, PLATFORM_COPY_COLUMNS, gpl_df)
+
+            # Move the staged rows over in one statement, skipping probes that already exist
+            result = self.session.execute(text(
+                f"INSERT INTO {PlatformAnnotation.__tablename__} ({column_list}) "
+                f"SELECT {column_list} FROM {PLATFORM_STAGE_TABLE} "
+                f'ON CONFLICT ("ProbeID") DO NOTHING'
+            ))
+            logger.info(f"Successfully inserted {result.rowcount} of {len(gpl_df)} rows into PlatformAnnotation.")
+        except (SQLAlchemyError, Psycopg2Error) as e:
             self.session.rollback()
             logger.error(f"Failed to populate PlatformAnnotation table: {e}")
             raise
@@ -95,6 +132,8 @@ class SimplifiedMicroarrayProcessor:
                 sep="\t",
                 header=None,
                 names=["ProbeID", "ExpressionValue"],
+                dtype=GSM_DTYPES,
+                engine=GSM_CSV_ENGINE,
             )
             logger.info(f"Loaded GSM file with {len(gsm_df)} rows.")
             return gsm_df
@@ -102,7 +141,27 @@ class SimplifiedMicroarrayProcessor:
             logger.error(f"Failed to load GSM file: {gsm_file_path}. Error: {e}")
             raise
 
-    def populate_microarray_data(self, gsm_df: pd.DataFrame, sample_id: str, series_id: str) -> None:
+    def load_valid_probes(self) -> frozenset:
+        """
+        Loads the ProbeIDs present in the PlatformAnnotation table.
+
+        The set is fetched once per series so GSM rows can be checked against the
+        platform without a database lookup per row. It is immutable, so it can be
+        shared with the GSM reader threads without copying.
+
+        Returns:
+            frozenset: ProbeIDs that MicroarrayData rows may reference.
+        """
+        try:
+            valid_probes = frozenset(self.session.scalars(select(PlatformAnnotation.ProbeID)))
+            logger.info(f"Loaded {len(valid_probes)} valid ProbeIDs.")
+            return valid_probes
+        except SQLAlchemyError as e:
+            logger.error(f"Failed to load ProbeIDs from PlatformAnnotation: {e}")
+            raise
+
+    def populate_microarray_data(self, gsm_df: pd.DataFrame, sample_id: str, series_id: str,
+                                 valid_probes: frozenset) -> None:
         """
         Populates the MicroarrayData table using the GSM DataFrame for a specific sample.
 
@@ -110,28 +169,81 @@ class SimplifiedMicroarrayProcessor:
             gsm_df (pd.DataFrame): DataFrame containing sample expression data.
             sample_id (str): Sample ID.
             series_id (str): Series ID.
+            valid_probes (frozenset): ProbeIDs known to PlatformAnnotation; other rows are skipped.
         """
         try:
-            data_batch = [
-                MicroarrayData(
-                    SampleID=sample_id,
-                    ProbeID=row["ProbeID"],
-                    SeriesID=series_id,
-                    ExpressionValue=row["ExpressionValue"],
-                )
-                for _, row in gsm_df.iterrows()
-            ]
-            self.session.bulk_save_objects(data_batch)
-            self.session.commit()
+            # Drop rows for unknown probes, which would violate the foreign key, in one vectorized pass
+            gsm_df = gsm_df[gsm_df["ProbeID"].isin(valid_probes)]
+
+            # Add the sample and series columns column-wise instead of creating one ORM object per row
+            data_batch = gsm_df.assign(SampleID=sample_id, SeriesID=series_id)
+
+            # Stream the rows through COPY, which skips per-row INSERT parsing entirely. The savepoint
+            # lets a failing sample roll back on its own inside the series transaction.
+            if not data_batch.empty:
+                with self.session.begin_nested():
+                    # NaN is written literally so the NOT NULL float column receives NaN rather than NULL
+                    self._copy_rows(MicroarrayData.__tablename__, MICROARRAY_COPY_COLUMNS, data_batch, na_rep="NaN")
             logger.info(f"Successfully inserted {len(data_batch)} rows for SampleID: {sample_id}.")
-        except SQLAlchemyError as e:
-            self.session.rollback()
+        except (SQLAlchemyError, Psycopg2Error) as e:
             logger.error(f"Failed to insert data for SampleID '{sample_id}': {e}")
 
+    def _copy_rows(self, table_name: str, columns: tuple, frame: pd.DataFrame, na_rep: str = "") -> None:
+        """
+        Bulk loads DataFrame rows into a table with PostgreSQL COPY.
+
+        The rows are serialized to CSV in memory and sent over the session's own
+        connection, so they are part of the current transaction.
+
+        Args:
+            table_name (str): Name of the target table.
+            columns (tuple): Table columns to fill, in the order they are written.
+            frame (pd.DataFrame): Rows to load; must contain every column in `columns`.
+            na_rep (str): Text written for missing values; the default empty field loads as NULL.
+        """
+        buffer = io.StringIO()
+        frame.to_csv(buffer, columns=list(columns), header=False, index=False, na_rep=na_rep)
+        buffer.seek(0)
+
+        column_list = ", ".join(f'"{column}"' for column in columns)
+        copy_sql = f"COPY {table_name} ({column_list}) FROM STDIN WITH (FORMAT csv)"
+
+        # Use the DB-API connection behind the session so COPY shares its transaction
+        cursor = self.session.connection().connection.cursor()
+        try:
+            cursor.copy_expert(copy_sql, buffer)
+        finally:
+            cursor.close()
+
+    def _read_gsm_files(self, gsm_files: list) -> Iterator[Tuple[str, Future]]:
+        """
+        Reads GSM files on a thread pool ahead of the database writer.
+
+        At most `GSM_READ_AHEAD` files are read or waiting at any time, so memory stays
+        bounded when reading is faster than loading. Results come back in input order.
+
+        Args:
+            gsm_files (list): (file name, file path) pairs to read.
+
+        Yields:
+            Tuple[str, Future]: The file name and the future holding its DataFrame.
+        """
+        with ThreadPoolExecutor(max_workers=GSM_READ_WORKERS) as executor:
+            pending = deque()
+            for file_name, gsm_file_path in gsm_files:
+                pending.append((file_name, executor.submit(self.load_gsm_file, gsm_file_path)))
+                if len(pending) >= GSM_READ_AHEAD:
+                    yield pending.popleft()
+            while pending:
+                yield pending.popleft()
+
     def process_microarray_data(self, zip_file_path: str, series_id: str) -> None:
         """
         Processes microarray data from a ZIP file and populates the database.
 
+        The platform annotations and all samples of the series are written in a single
+        transaction that is committed once at the end.
+
         Args:
             zip_file_path (str): Path to the ZIP file.
             series_id (str): Series ID.
@@ -145,6 +257,10 @@ class SimplifiedMicroarrayProcessor:
                 zip_ref.extractall(extract_to)
             logger.info(f"Extracted ZIP file: {zip_file_path}")
 
+            # The series is one re-runnable bulk load; skip waiting for the WAL flush on its commit.
+            # SET LOCAL only lasts until this transaction ends, so pooled connections are unaffected.
+            self.session.execute(text("SET LOCAL synchronous_commit = off"))
+
             # Step 2: Locate and process GPL file
             nested_directory = os.path.join(extract_to, series_id)
             gpl_file_path = os.path.join(nested_directory, "GPL570-tbl-1.txt")
@@ -153,17 +269,30 @@ class SimplifiedMicroarrayProcessor:
             # Upload ProbeIDs first to avoid foreign key constraints
             self.populate_platform_annotation(gpl_df)
 
+            # Fetch the valid ProbeIDs once for every GSM file of the series
+            valid_probes = self.load_valid_probes()
+
             # Step 3: Process GSM files
-            for file_name in os.listdir(nested_directory):
-                if file_name.startswith("GSM") and file_name.endswith(".txt"):
-                    gsm_file_path = os.path.join(nested_directory, file_name)
-                    sample_id = file_name.split("-")[0]  # Extract SampleID from the file name
-                    try:
-                        gsm_df = self.load_gsm_file(gsm_file_path)
-                        self.populate_microarray_data(gsm_df, sample_id, series_id)
-                    except Exception as e:
-                        logger.error(f"Error processing GSM file '{file_name}' for SampleID '{sample_id}': {e}")
+            # scandir returns each entry's full path and cached file type, so no joins or extra stats
+            with os.scandir(nested_directory) as entries:
+                gsm_files = [
+                    (entry.name, entry.path)
+                    for entry in entries
+                    if entry.name.startswith("GSM") and entry.name.endswith(".txt") and entry.is_file()
+                ]
+            # Files are parsed on worker threads while this thread writes the ones already read
+            for file_name, gsm_future in self._read_gsm_files(gsm_files):
+                sample_id = file_name.split("-")[0]  # Extract SampleID from the file name
+                try:
+                    gsm_df = gsm_future.result()
+                    self.populate_microarray_data(gsm_df, sample_id, series_id, valid_probes)
+                except Exception as e:
+                    logger.error(f"Error processing GSM file '{file_name}' for SampleID '{sample_id}': {e}")
+
+            # Commit the platform annotations and every sample of the series at once
+            self.session.commit()
         except Exception as e:
+            self.session.rollback()
             logger.error(f"Error processing microarray data for SeriesID '{series_id}': {e}")
         finally:
             self.session.close()
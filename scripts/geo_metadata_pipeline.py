@@ -9,10 +9,11 @@ import json
 from pipeline.geo_pipeline.geo_metadata_downloader import GeoMetadataDownloader
 from pipeline.geo_pipeline.geo_metadata_etl import GeoMetadataETL
 from pipeline.geo_pipeline.geo_file_handler import GeoFileHandler
-from config.db_config import get_session_context
+from config.db_config import get_postgres_engine, get_session_context
 from utils.connection_checker import DatabaseConnectionChecker
 from utils.exceptions import MissingForeignKeyError
 from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import exists, func, select
 from config.logger_config import configure_logger
 from db.schema.geo_metadata_schema import GeoSeriesMetadata, GeoSampleMetadata
 from pipeline.geo_pipeline.geo_classifier import DataTypeDeterminer
@@ -40,7 +41,7 @@ class GeoMetadataPipeline:
     """
     stats: dict[str, float]
 
-    def __init__(self, geo_ids: list, parallel: bool = True, batch_size: int = None):
+    def __init__(self, geo_ids: list, parallel: bool = True, batch_size: int = None, max_workers: int = None):
         """
         Initializes the GeoMetadataPipeline with options for parallel and batch processing.
 
@@ -48,6 +49,9 @@ class GeoMetadataPipeline:
             geo_ids (list): A list of GEO IDs to process.
             parallel (bool): Whether to enable parallel processing.
             batch_size (int): Number of GEO IDs to process in a single batch. Only used if parallel is False.
+            max_workers (int): Number of GEO IDs processed concurrently when parallel is True.
+                Defaults to the PostgreSQL pool size so every worker can hold a pooled connection;
+                the default is only resolved when a parallel run starts.
 
         Raises:
             ValueError: If geo_ids is not a non-empty list.
@@ -59,6 +63,7 @@ class GeoMetadataPipeline:
         self.geo_ids = geo_ids  # Assign GEO IDs to an instance variable
         self.parallel = parallel  # Store the parallel processing option
         self.batch_size = batch_size  # Store the batch size if provided
+        self.max_workers = max_workers  # Store the worker count if provided
 
         # Validate that the metadata extraction template exists
         if not os.path.exists(EXTRACTION_TEMPLATE):
@@ -174,16 +179,24 @@ class GeoMetadataPipeline:
                         if dataset.get("type", "").lower().startswith("superseries of")
                     ]
 
+                    # Fetch which SubSeries have samples with one query instead of a COUNT per SubSeries
+                    subseries_with_samples = set(session.scalars(
+                        select(GeoSampleMetadata.SeriesID)
+                        .where(GeoSampleMetadata.SeriesID.in_(subseries_ids))
+                        .distinct()
+                    )) if subseries_ids else set()
+
                     for subseries_id in subseries_ids:
                         # Check if the SubSeries has samples
-                        samples_exist = session.query(GeoSampleMetadata).filter_by(SeriesID=subseries_id).count() > 0
-                        if not samples_exist:
+                        if subseries_id not in subseries_with_samples:
                             raise RuntimeError(
                                 f"Validation failed: Missing samples for SubSeries {subseries_id} referenced by {geo_id}."
                             )
                 else:
-                    # Check if the Series has samples
-                    samples_exist = session.query(GeoSampleMetadata).filter_by(SeriesID=geo_id).count() > 0
+                    # Check if the Series has samples; EXISTS stops at the first match instead of counting all
+                    samples_exist = session.scalar(
+                        select(exists().where(GeoSampleMetadata.SeriesID == geo_id))
+                    )
                     if not samples_exist:
                         raise RuntimeError(f"Validation failed: Missing samples for SeriesID {geo_id}.")
 
@@ -290,8 +303,11 @@ class GeoMetadataPipeline:
             self.file_handler.initialize_log_table()
 
             if self.parallel:
-                # Use ThreadPoolExecutor for parallel processing of GEO IDs
-                with ThreadPoolExecutor() as executor:
+                # Bound parallel workers by the connection pool; extra threads would only queue on pool checkout.
+                # Resolved here so sequential runs never build the engine just to size the pool.
+                max_workers = self.max_workers or min(32, (os.cpu_count() or 1) + 4, get_postgres_engine().pool.size())
+                # Use ThreadPoolExecutor for parallel processing of GEO IDs, one pooled connection per worker
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
                     # Submit each GEO ID as a separate task
                     futures = {executor.submit(self.download_extract_upload, geo_id): geo_id for geo_id in self.geo_ids}
                     for future in futures:
@@ -404,13 +420,14 @@ class GeoMetadataPipeline:
 
             # Query the database for sample counts per series
             with get_session_context() as session:
-                # Fetch sample counts for each series in the database
-                series_sample_counts = {
-                    series.SeriesID: session.query(GeoSampleMetadata)
-                    .filter_by(SeriesID=series.SeriesID)
-                    .count()
-                    for series in session.query(GeoSeriesMetadata).all()
-                }
+                # Fetch sample counts for every series in one grouped query; the outer join keeps
+                # series without samples at zero
+                series_sample_counts = dict(
+                    session.query(GeoSeriesMetadata.SeriesID, func.count(GeoSampleMetadata.SampleID))
+                    .outerjoin(GeoSampleMetadata, GeoSampleMetadata.SeriesID == GeoSeriesMetadata.SeriesID)
+                    .group_by(GeoSeriesMetadata.SeriesID)
+                    .all()
+                )
 
             # Update stats with series and sample counts
             self.stats["series_sample_counts"] = series_sample_counts
@@ -418,7 +435,7 @@ class GeoMetadataPipeline:
             self.stats["total_samples"] = sum(series_sample_counts.values())
 
             # Debug log to verify per-series sample counts
-            self.logger.debug(f"Series sample counts: {series_sample_counts}")
+            self.logger.debug("Series sample counts: %s", series_sample_counts)
 
             # Save the statistics dictionary to the summary report file
             with open(summary_path, "w") as summary_file:
@@ -1,5 +1,6 @@
 import json
 import re
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import SQLAlchemyError
 from config.db_config import get_session_context
 from config.logger_config import configure_logger
@@ -15,6 +16,9 @@ ENSEMBL_GENE_REGEX = re.compile(r"^ENSG\d{11}(\.\d+)?$")
 ENSEMBL_PROTEIN_REGEX = re.compile(r"^ENSP\d{11}(\.\d+)?$")
 ENSEMBL_TRANSCRIPT_REGEX = re.compile(r"^ENST\d{11}(\.\d+)?$")
 
+# Optional identifiers parse_entry may fill in; unset ones are inserted as NULL
+MAPPING_ROW_DEFAULTS = {"ensembl_gene_id": None, "ensembl_transcript_id": None, "ensembl_protein_id": None}
+
 
 def load_data_by_type(data_type: str) -> dict:
     """
@@ -132,17 +136,18 @@ def populate_mapping_table(data_by_source: dict, data_type: str, batch_size: int
                 logger.info(f"Processing {len(data)} rows of {data_type} data from {source}...")
                 for start in range(0, len(data), batch_size):
                     batch = data[start:start + batch_size]
+                    rows = []
                     for entry in batch:
                         parsed_entry = parse_entry(entry, data_type)
                         if not parsed_entry:
                             total_skipped += 1
                             continue
-                        try:
-                            mapping_entry = MappingTable(**parsed_entry)
-                            session.merge(mapping_entry)  # Add or update rows
-                        except Exception as e:
-                            logger.error(f"Error processing entry {parsed_entry}: {e}")
-                            traceback.print_exc()
+                        # Every row carries the same keys so the batch can be sent as one executemany
+                        rows.append({**MAPPING_ROW_DEFAULTS, **parsed_entry})
+
+                    # One INSERT ... ON CONFLICT DO NOTHING per batch instead of a merge() per row
+                    if rows:
+                        session.execute(insert(MappingTable).on_conflict_do_nothing(), rows)
 
                     session.commit()
                     total_inserted += len(batch)
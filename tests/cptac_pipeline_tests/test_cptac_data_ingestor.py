@@ -0,0 +1,99 @@
+# File: tests/cptac_pipeline_tests/test_cptac_data_ingestor.py
+
+import pandas as pd
+import pytest
+from unittest.mock import patch, MagicMock
+from sqlalchemy.exc import SQLAlchemyError
+
+# The ingestor imports the cptac package at module level
+pytest.importorskip("cptac")
+
+from pipeline.cptac_pipeline.cptac_data_ingestor import CPTACDataIngestor
+from db.schema.cptac_metadata_schema import CptacMetadataLog
+
+
+@pytest.fixture
+def ingestor():
+    """
+    Fixture to create a CPTACDataIngestor whose mapper IDs resolve without touching the database.
+    """
+    ingestor = CPTACDataIngestor("Hnscc")
+    with patch.object(ingestor, "get_mapper_id", return_value=1):
+        yield ingestor
+
+
+@pytest.fixture
+def metadata_entry():
+    """
+    Fixture for the metadata entry of the proteomics dataset.
+    """
+    entry = MagicMock()
+    entry.data_type = "proteomics"
+    entry.source = "umich"
+    return entry
+
+
+@pytest.fixture
+def sample_data():
+    """
+    Fixture for the preprocessed proteomics rows of one sample.
+    """
+    return pd.DataFrame({
+        "feature": ["A1BG", "A2M"],
+        "quantification": [0.25, -1.5],
+    })
+
+
+COLUMN_MAPPINGS = {"A1BG": "ENSP00000263100.2", "A2M": "ENSP00000323929.3"}
+
+
+def _log_entries(session):
+    """
+    Returns the CptacMetadataLog rows added to a mocked session.
+    """
+    return [call.args[0] for call in session.add.call_args_list if isinstance(call.args[0], CptacMetadataLog)]
+
+
+def test_upload_commits_data_and_log_together(ingestor, metadata_entry, sample_data):
+    """
+    Test that the data batch and its "uploaded" log row are committed in a single transaction.
+    """
+    session = MagicMock()
+
+    ingestor.upload_proteomics_data(session, "C3L-00006", sample_data, metadata_entry, COLUMN_MAPPINGS,
+                                    mapper_table=MagicMock())
+
+    method_names = [name for name, _, _ in session.mock_calls]
+    assert method_names == ["bulk_save_objects", "add", "commit"]
+    assert len(session.bulk_save_objects.call_args.args[0]) == 2
+    assert [(entry.SampleID, entry.Status) for entry in _log_entries(session)] == [("C3L-00006", "uploaded")]
+    session.rollback.assert_not_called()
+
+
+def test_failed_log_rolls_back_data_batch(ingestor, metadata_entry, sample_data):
+    """
+    Test that a failing "uploaded" log row discards the uncommitted data instead of committing it.
+    """
+    session = MagicMock()
+    # The first add (the "uploaded" log row) fails; the "failed" log row is added normally.
+    session.add.side_effect = [SQLAlchemyError("value too long"), None]
+
+    ingestor.upload_proteomics_data(session, "C3L-00006", sample_data, metadata_entry, COLUMN_MAPPINGS,
+                                    mapper_table=MagicMock())
+
+    method_names = [name for name, _, _ in session.mock_calls]
+    assert method_names == ["bulk_save_objects", "add", "rollback", "add", "commit"]
+    assert [entry.Status for entry in _log_entries(session)] == ["uploaded", "failed"]
+
+
+def test_log_without_commit_reraises(ingestor):
+    """
+    Test that log_cptac_upload leaves rollback to the caller when it does not own the commit.
+    """
+    session = MagicMock()
+    session.add.side_effect = SQLAlchemyError("value too long")
+
+    with pytest.raises(SQLAlchemyError):
+        ingestor.log_cptac_upload(session, "C3L-00006", "proteomics", "umich", "uploaded", commit=False)
+
+    session.rollback.assert_not_called()
@@ -73,15 +73,11 @@ def test_initialize_log_table(mock_session_context, mock_isfile, mock_exists, ge
         },
     ]
 
-    actual_values = [
-        call[0][0].compile().params for call in mock_session.execute.call_args_list
-    ]
+    # All GEO IDs are sent in a single executemany call
+    mock_session.execute.assert_called_once()
+    _, actual_values = mock_session.execute.call_args[0]
 
-    for expected in expected_values:
-        assert any(
-            all(expected[key] == actual[key] for key in expected)
-            for actual in actual_values
-        )
+    assert actual_values == expected_values
 
     mock_session.commit.assert_called_once()
 
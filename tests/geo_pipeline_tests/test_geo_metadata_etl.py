@@ -1,12 +1,15 @@
 import pytest
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy import create_engine
+from sqlalchemy.exc import SQLAlchemyError
 from unittest.mock import patch, MagicMock
 from pipeline.geo_pipeline.geo_metadata_etl import GeoMetadataETL
 from pipeline.geo_pipeline.geo_file_handler import GeoFileHandler
 from db.schema.geo_metadata_schema import GeoSeriesMetadata, GeoSampleMetadata
 from lxml import etree
 import json
+from logging.handlers import RotatingFileHandler
+from pipeline.geo_pipeline import geo_metadata_etl
 
 
 # Define a PostgreSQL database URL for testing
@@ -265,3 +268,298 @@ def test_empty_template_file(tmp_path, valid_miniml_file, file_handler):
     with pytest.raises(KeyError, match="Missing required keys in template"):
         GeoMetadataETL(valid_miniml_file, str(empty_template_path), file_handler=file_handler)
 
+
+def test_compiled_xpath_shared_across_instances(valid_miniml_file, valid_template_file, file_handler):
+    """
+    Test that template XPath expressions are compiled once and reused by later instances.
+    """
+    from pipeline.geo_pipeline.geo_metadata_etl import _compile_xpath, MINIML_NAMESPACES
+
+    GeoMetadataETL(valid_miniml_file, valid_template_file, file_handler=file_handler)
+    hits_before = _compile_xpath.cache_info().hits
+    GeoMetadataETL(valid_miniml_file, valid_template_file, file_handler=file_handler)
+
+    ns_key = tuple(sorted(MINIML_NAMESPACES.items()))
+    assert _compile_xpath.cache_info().hits > hits_before
+    assert _compile_xpath(".//geo:Title", ns_key) is _compile_xpath(".//geo:Title", ns_key)
+
+
+def test_invalid_template_xpath_rejected(valid_miniml_file, file_handler, tmp_path):
+    """
+    Test that a template path the field plan could not compile is rejected at construction time.
+    """
+    template_path = tmp_path / "template.json"
+    template_path.write_text(json.dumps({
+        "Series": {"SeriesID": ".//geo:Accession[@database='GEO']/text()"},
+        "Sample": {"SampleID": ".//geo:Accession[@database='GEO'"}
+    }))
+
+    with pytest.raises(etree.XPathSyntaxError):
+        GeoMetadataETL(valid_miniml_file, str(template_path), file_handler=file_handler)
+
+
+def test_extract_many_matches_single_file_extraction(valid_miniml_file, valid_template_file, file_handler):
+    """
+    Test that parallel extraction returns the same records as extracting the file directly.
+    """
+    etl = GeoMetadataETL(valid_miniml_file, valid_template_file, file_handler=file_handler)
+    expected = etl.extract_metadata()
+
+    results = dict(GeoMetadataETL.extract_many([valid_miniml_file], valid_template_file, max_workers=1))
+
+    assert results == {valid_miniml_file: expected}
+    assert expected["Series"]["SeriesID"] == "GSE123456"
+    assert [sample["SampleID"] for sample in expected["Samples"]] == ["GSM123456"]
+
+
+def test_nested_child_paths_match_xpath(valid_miniml_file, valid_template_file, file_handler):
+    """
+    Test that multi-step child paths resolved through the tag buckets agree with XPath.
+    """
+    extractor = GeoMetadataETL(valid_miniml_file, valid_template_file, file_handler=file_handler)
+    ns = {'geo': 'http://www.ncbi.nlm.nih.gov/geo/info/MINiML'}
+    sample_elem = etree.fromstring("""
+    <Sample xmlns="http://www.ncbi.nlm.nih.gov/geo/info/MINiML" iid="GSM1">
+        <Status><Submission-Date>2020-01-01</Submission-Date></Status>
+        <Channel position="1">
+            <Source>tumor</Source>
+            <Characteristics tag="tissue">oral cavity</Characteristics>
+        </Channel>
+        <Channel position="2">
+            <Characteristics tag="hpv">positive</Characteristics>
+        </Channel>
+    </Sample>
+    """)
+    field_paths = {
+        "SubmissionDate": "geo:Status/geo:Submission-Date",
+        "Source": "geo:Channel/geo:Source",
+        "Characteristics": "geo:Channel/geo:Characteristics",
+    }
+
+    fields = extractor._extract_fields(sample_elem, field_paths, ns)
+
+    assert fields["SubmissionDate"] == "2020-01-01"
+    assert fields["Source"] == "tumor"
+    assert fields["Characteristics"] == [
+        {"tag": char.get("tag"), "value": char.text}
+        for char in sample_elem.xpath("geo:Channel/geo:Characteristics", namespaces=ns)
+    ]
+
+
+@pytest.mark.parametrize("strict_validate", [False, True])
+@patch("pipeline.geo_pipeline.geo_metadata_etl.get_postgres_engine")
+@patch("pipeline.geo_pipeline.geo_metadata_etl.sessionmaker")
+def test_validate_xml_pass_only_in_strict_mode(mock_sessionmaker, mock_engine, strict_validate,
+                                               valid_miniml_file, valid_template_file, file_handler):
+    """
+    Test that the separate well-formedness pass only runs when strict validation is requested.
+    """
+    mock_session = MagicMock()
+    mock_session.execute.return_value.rowcount = 1  # Simulate successful insert
+    mock_sessionmaker.return_value = lambda: mock_session
+    extractor = GeoMetadataETL(valid_miniml_file, valid_template_file, file_handler=MagicMock(),
+                               strict_validate=strict_validate)
+
+    with patch.object(extractor, "_validate_xml") as mock_validate_xml:
+        extractor.parse_and_stream()
+
+    assert mock_validate_xml.called is strict_validate
+
+
+@pytest.mark.parametrize("prolog", ['<?xml-stylesheet href="a.xsl"?>', "<!-- exported from GEO -->"])
+def test_validate_xml_allows_nodes_before_root(prolog, valid_miniml_file, valid_template_file, file_handler):
+    """
+    Test that strict validation accepts a processing instruction or comment ahead of the root element.
+    """
+    with open(valid_miniml_file) as f:
+        content = f.read()
+    with open(valid_miniml_file, "w") as f:
+        f.write(f'<?xml version="1.0" encoding="UTF-8"?>\n{prolog}\n{content.strip()}')
+    extractor = GeoMetadataETL(valid_miniml_file, valid_template_file, file_handler=file_handler,
+                               strict_validate=True)
+
+    extractor._validate_xml()
+
+
+def _write_series_with_samples(tmp_path, sample_count):
+    """
+    Writes a MINiML file with one Series and the given number of Samples (GSM1, GSM2, ...).
+    """
+    samples = "".join(
+        f"""
+        <Sample iid="GSM{i}">
+            <Title>Sample {i}</Title>
+            <Accession database="GEO">GSM{i}</Accession>
+        </Sample>""" for i in range(1, sample_count + 1)
+    )
+    xml_file = tmp_path / "GSE123456_family.xml"
+    xml_file.write_text(f"""<?xml version="1.0" encoding="UTF-8"?>
+    <MINiML xmlns="http://www.ncbi.nlm.nih.gov/geo/info/MINiML">
+        <Series iid="GSE123456">
+            <Title>Test Series</Title>
+            <Accession database="GEO">GSE123456</Accession>
+        </Series>{samples}
+    </MINiML>""")
+    return xml_file
+
+
+@patch("pipeline.geo_pipeline.geo_metadata_etl.SAMPLE_INSERT_BATCH_SIZE", 2)
+@patch("pipeline.geo_pipeline.geo_metadata_etl.get_postgres_engine")
+@patch("pipeline.geo_pipeline.geo_metadata_etl.sessionmaker")
+def test_samples_inserted_in_batches(mock_sessionmaker, mock_engine, valid_template_file, tmp_path):
+    """
+    Test that new Samples are sent as multi-row inserts and counted from the RETURNING rows.
+    """
+    xml_file = _write_series_with_samples(tmp_path, 3)
+
+    mock_session = MagicMock()
+    mock_session.scalars.return_value = iter([])  # No existing samples
+    # First batch inserts both rows, the trailing batch hits an existing row.
+    mock_session.execute.return_value.scalars.return_value.all.side_effect = [["GSM1", "GSM2"], []]
+    mock_sessionmaker.return_value = lambda: mock_session
+    extractor = GeoMetadataETL(str(xml_file), valid_template_file, file_handler=MagicMock())
+
+    with patch.object(extractor, "_stream_series_to_db"), \
+            patch.object(extractor, "_update_series_sample_count"):
+        new_samples = extractor.parse_and_stream()
+
+    assert new_samples == 2
+    assert mock_session.execute.return_value.scalars.return_value.all.call_count == 2
+
+
+@patch("pipeline.geo_pipeline.geo_metadata_etl.SAMPLE_INSERT_BATCH_SIZE", 2)
+@patch("pipeline.geo_pipeline.geo_metadata_etl.get_postgres_engine")
+@patch("pipeline.geo_pipeline.geo_metadata_etl.sessionmaker")
+def test_failed_sample_batch_retries_row_by_row(mock_sessionmaker, mock_engine, valid_template_file, tmp_path):
+    """
+    Test that a batch with one bad row is rolled back to its savepoint and retried per row,
+    so only the bad row is lost and later batches are still inserted.
+    """
+    xml_file = _write_series_with_samples(tmp_path, 5)
+
+    mock_session = MagicMock()
+    mock_session.scalars.return_value = iter([])  # No existing samples
+    # GSM4 violates a constraint: the middle batch fails, its per-row retry keeps GSM3 and drops GSM4.
+    mock_session.execute.return_value.scalars.return_value.all.side_effect = [
+        ["GSM1", "GSM2"], SQLAlchemyError("null value in column"), ["GSM3"], SQLAlchemyError("null value in column"),
+        ["GSM5"]
+    ]
+    mock_sessionmaker.return_value = lambda: mock_session
+    extractor = GeoMetadataETL(str(xml_file), valid_template_file, file_handler=MagicMock())
+
+    with patch.object(extractor, "_stream_series_to_db"), \
+            patch.object(extractor, "_update_series_sample_count"):
+        new_samples = extractor.parse_and_stream()
+
+    assert new_samples == 4
+    # One savepoint per batch plus one per retried row; failing ones saw the exception and rolled back.
+    exit_calls = mock_session.begin_nested.return_value.__exit__.call_args_list
+    assert [call.args[0] for call in exit_calls] == [None, SQLAlchemyError, None, SQLAlchemyError, None]
+    retried_rows = [call.args[0].compile().params for call in mock_session.execute.call_args_list[-3:-1]]
+    assert [params["SampleID_m0"] for params in retried_rows] == ["GSM3", "GSM4"]
+
+
+def test_accepts_path_like_inputs(valid_miniml_file, valid_template_file, file_handler):
+    """
+    Test that pathlib paths are normalized to strings at construction time.
+    """
+    from pathlib import Path
+
+    extractor = GeoMetadataETL(Path(valid_miniml_file), Path(valid_template_file), file_handler=file_handler)
+
+    assert extractor.file_path == valid_miniml_file
+    assert extractor.extract_metadata()["Series"]["SeriesID"] == "GSE123456"
+
+
+def test_extract_samples_to_table(valid_miniml_file, valid_template_file, tmp_path):
+    """
+    Test that Sample metadata from many files is collected into one Arrow column per template field.
+    """
+    pyarrow = pytest.importorskip("pyarrow")
+    template_path = tmp_path / "samples_template.json"
+    template = json.loads(open(valid_template_file).read())
+    template["Sample"]["Organism"] = ".//geo:Organism/text()"  # Absent from every Sample
+    template_path.write_text(json.dumps(template))
+
+    table = GeoMetadataETL.extract_samples_to_table([valid_miniml_file], str(template_path), max_workers=1)
+
+    assert table.column_names == ["SampleID", "Title", "Characteristics", "Organism", "SeriesID"]
+    assert table.column("SeriesID").to_pylist() == ["GSE123456"]
+    assert table.column("SampleID").to_pylist() == ["GSM123456"]
+    assert table.column("Characteristics").to_pylist() == [[{"tag": "test-tag", "value": "Test Value"}]]
+    assert table.schema.field("Organism").type == pyarrow.string()
+    assert table.column("Organism").null_count == 1
+
+
+def test_extract_many_reuses_worker_extractor_across_files(valid_miniml_file, valid_template_file, tmp_path):
+    """
+    Test that a single worker extracting several files attributes records to each file's SeriesID.
+    """
+    second_file = tmp_path / "GSE654321_family.xml"
+    second_file.write_text(open(valid_miniml_file).read())
+
+    results = dict(GeoMetadataETL.extract_many([valid_miniml_file, str(second_file)], valid_template_file,
+                                               max_workers=1))
+
+    assert results[valid_miniml_file]["Series"]["SeriesID"] == "GSE123456"
+    assert results[str(second_file)]["Series"]["SeriesID"] == "GSE654321"
+    assert results[str(second_file)]["Samples"][0]["SeriesID"] == "GSE654321"
+
+
+def test_extract_worker_logs_to_console_only(valid_miniml_file, valid_template_file):
+    """
+    Test that extract workers build their ETL instance without a rotating file handler.
+    """
+    geo_metadata_etl._init_extract_worker(valid_template_file)
+    geo_metadata_etl._extract_file(valid_miniml_file)
+
+    worker_logger = geo_metadata_etl._worker_extractor.logger
+    assert worker_logger.handlers
+    assert not any(isinstance(handler, RotatingFileHandler) for handler in worker_logger.handlers)
+
+
+def test_extract_samples_to_table_rejects_incomplete_template(valid_miniml_file, tmp_path):
+    """
+    Test that the table builder validates the template before starting any workers.
+    """
+    template_file = tmp_path / "template.json"
+    template_file.write_text(json.dumps({"Sample": {"SampleID": "@iid"}}))
+
+    with patch.object(GeoMetadataETL, "extract_many") as mock_extract_many:
+        with pytest.raises(KeyError, match="Series"):
+            GeoMetadataETL.extract_samples_to_table([valid_miniml_file], str(template_file))
+
+    mock_extract_many.assert_not_called()
+
+
+def test_export_ndjson_streams_records(valid_miniml_file, valid_template_file, file_handler, tmp_path):
+    """
+    Test that records are exported one JSON object per line, in document order.
+    """
+    extractor = GeoMetadataETL(valid_miniml_file, valid_template_file, file_handler=file_handler)
+    output_path = tmp_path / "GSE123456.ndjson"
+
+    record_count = extractor.export_ndjson(output_path)
+
+    lines = [json.loads(line) for line in output_path.read_text().splitlines()]
+    assert record_count == len(lines) == 2
+    assert [line["type"] for line in lines] == ["Series", "Sample"]
+    assert lines[1]["record"]["SampleID"] == "GSM123456"
+
+
+@patch("pipeline.geo_pipeline.geo_metadata_etl.get_postgres_engine")
+@patch("pipeline.geo_pipeline.geo_metadata_etl.sessionmaker")
+def test_streaming_reports_malformed_xml(mock_sessionmaker, mock_engine, valid_template_file, tmp_path):
+    """
+    Test that malformed XML is reported by the streaming pass without a separate validation pass.
+    """
+    mock_session = MagicMock()
+    mock_sessionmaker.return_value = lambda: mock_session
+    malformed_file = tmp_path / "GSE123456_family.xml"
+    malformed_file.write_text('<MINiML xmlns="http://www.ncbi.nlm.nih.gov/geo/info/MINiML"><Sample>')
+
+    extractor = GeoMetadataETL(str(malformed_file), valid_template_file, file_handler=MagicMock())
+
+    with pytest.raises(RuntimeError, match="Invalid XML structure"):
+        extractor.parse_and_stream()
+    mock_session.rollback.assert_called_once()
@@ -0,0 +1,152 @@
+# File: tests/geo_pipeline_tests/test_microarray_processor.py
+
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import patch, MagicMock
+from pipeline.geo_pipeline.microarray_processor import SimplifiedMicroarrayProcessor
+
+# Excerpt of a GSM sample table as shipped in GEO series archives: headerless, tab-separated
+# ProbeID / ExpressionValue pairs, including numeric-looking probe IDs and a missing value
+GSM_TABLE = (
+    "1007_s_at\t9.623843\n"
+    "1053_at\t7.3198524\n"
+    "117_at\t5.6130734\n"
+    "7892501\t3.1\n"
+    "AFFX-BioB-5_at\t\n"
+    "1255_g_at\t2\n"
+)
+
+
+@pytest.fixture
+def gsm_files(tmp_path):
+    """
+    Fixture to write two GSM sample tables to disk.
+    """
+    files = []
+    for sample_id in ("GSM1001", "GSM1002"):
+        path = tmp_path / f"{sample_id}-tbl-1.txt"
+        path.write_text(GSM_TABLE)
+        files.append((path.name, str(path)))
+    return files
+
+
+def _read_frames(gsm_files, engine):
+    """
+    Reads the GSM files through the processor's reader threads with the given CSV engine.
+    """
+    processor = SimplifiedMicroarrayProcessor(session=MagicMock())
+    with patch("pipeline.geo_pipeline.microarray_processor.GSM_CSV_ENGINE", engine):
+        return {file_name: future.result() for file_name, future in processor._read_gsm_files(gsm_files)}
+
+
+def test_read_gsm_files_preserves_order(gsm_files):
+    """
+    Test that GSM files come back in input order with the declared column types.
+    """
+    frames = _read_frames(gsm_files, "c")
+
+    assert list(frames) == [file_name for file_name, _ in gsm_files]
+    frame = frames[gsm_files[0][0]]
+    assert frame["ProbeID"].tolist()[3] == "7892501"
+    assert frame["ExpressionValue"].dtype == "float64"
+    assert frame["ExpressionValue"].isna().sum() == 1
+
+
+def test_read_gsm_files_pyarrow_matches_c_engine(gsm_files):
+    """
+    Test that the pyarrow CSV engine reads GSM tables into the same frames as the C parser.
+    """
+    pytest.importorskip("pyarrow")
+
+    c_frames = _read_frames(gsm_files, "c")
+    arrow_frames = _read_frames(gsm_files, "pyarrow")
+
+    assert list(arrow_frames) == list(c_frames)
+    for file_name, c_frame in c_frames.items():
+        pd.testing.assert_frame_equal(arrow_frames[file_name], c_frame)
+
+
+@pytest.fixture
+def copy_session():
+    """
+    Fixture for a mocked session whose COPY cursor records each statement and CSV payload.
+    """
+    session = MagicMock()
+    session.copies = []
+    cursor = session.connection.return_value.connection.cursor.return_value
+    cursor.copy_expert.side_effect = lambda sql, buffer: session.copies.append((sql, buffer.read()))
+    return session
+
+
+def test_copy_rows_writes_csv_in_column_order(copy_session):
+    """
+    Test that COPY receives the listed columns in order, without header or index, and closes its cursor.
+    """
+    processor = SimplifiedMicroarrayProcessor(session=copy_session)
+    frame = pd.DataFrame({
+        "Description": ["alpha-1-B glycoprotein", np.nan],
+        "ProbeID": ["1007_s_at", "1053_at"],
+        "GeneSymbol": ["A1BG", "RFC2"],
+    })
+
+    processor._copy_rows("platform_annotation", ("ProbeID", "GeneSymbol", "Description"), frame)
+
+    assert copy_session.copies == [(
+        'COPY platform_annotation ("ProbeID", "GeneSymbol", "Description") FROM STDIN WITH (FORMAT csv)',
+        "1007_s_at,A1BG,alpha-1-B glycoprotein\n1053_at,RFC2,\n",
+    )]
+    copy_session.connection.return_value.connection.cursor.return_value.close.assert_called_once()
+
+
+def test_populate_platform_annotation_stages_and_skips_existing_probes(copy_session):
+    """
+    Test that GPL rows are copied into the staging table and moved over with ON CONFLICT DO NOTHING.
+    """
+    processor = SimplifiedMicroarrayProcessor(session=copy_session)
+    gpl_df = pd.DataFrame({
+        "ProbeID": ["1007_s_at", "7892501"],
+        "GeneSymbol": ["A1BG", np.nan],
+        "Description": [np.nan, "control probe"],
+    })
+
+    processor.populate_platform_annotation(gpl_df)
+
+    copy_sql, payload = copy_session.copies[0]
+    assert copy_sql.startswith("COPY _stage_platform_annotation ")
+    # Missing annotations are empty CSV fields, which COPY loads as NULL
+    assert payload == "1007_s_at,A1BG,\n7892501,,control probe\n"
+    statements = [str(call.args[0]) for call in copy_session.execute.call_args_list]
+    assert statements[-1].endswith('ON CONFLICT ("ProbeID") DO NOTHING')
+    copy_session.rollback.assert_not_called()
+
+
+def test_populate_microarray_data_filters_unknown_probes(copy_session):
+    """
+    Test that only probes known to the platform are copied, with NaN expression values written literally.
+    """
+    processor = SimplifiedMicroarrayProcessor(session=copy_session)
+    gsm_df = pd.DataFrame({
+        "ProbeID": ["1007_s_at", "UNKNOWN_at", "117_at"],
+        "ExpressionValue": [9.623843, 1.0, np.nan],
+    })
+
+    processor.populate_microarray_data(gsm_df, "GSM1001", "GSE41613", frozenset({"1007_s_at", "117_at"}))
+
+    copy_sql, payload = copy_session.copies[0]
+    assert '("SampleID", "SeriesID", "ProbeID", "ExpressionValue")' in copy_sql
+    assert payload == "GSM1001,GSE41613,1007_s_at,9.623843\nGSM1001,GSE41613,117_at,NaN\n"
+    copy_session.begin_nested.assert_called_once()
+
+
+def test_populate_microarray_data_skips_copy_without_known_probes(copy_session):
+    """
+    Test that a sample without any known probes issues no COPY.
+    """
+    processor = SimplifiedMicroarrayProcessor(session=copy_session)
+    gsm_df = pd.DataFrame({"ProbeID": ["UNKNOWN_at"], "ExpressionValue": [1.0]})
+
+    processor.populate_microarray_data(gsm_df, "GSM1001", "GSE41613", frozenset({"1007_s_at"}))
+
+    assert copy_session.copies == []
+    copy_session.begin_nested.assert_not_called()
@@ -0,0 +1,71 @@
+# File: tests/test_mapping_table_populator.py
+# Test cases for scripts/mapping_table_populator.py using pytest and a mocked session.
+
+import pytest
+from contextlib import contextmanager
+from unittest.mock import patch, MagicMock
+from sqlalchemy.dialects import postgresql
+from scripts.mapping_table_populator import populate_mapping_table, parse_entry, MAPPING_ROW_DEFAULTS
+
+
+@pytest.fixture
+def mock_session():
+    """
+    Mock fixture for the session handed out by get_session_context.
+    """
+    session = MagicMock()
+
+    @contextmanager
+    def session_context():
+        yield session
+
+    with patch("scripts.mapping_table_populator.get_session_context", session_context):
+        yield session
+
+
+def test_parse_entry_keeps_valid_ensembl_ids():
+    """
+    Test that only well-formed Ensembl IDs are kept for the data type.
+    """
+    assert parse_entry(["A1BG", "ENSP00000263100.2"], "proteomics") == {
+        "gene_id": "A1BG", "gene_symbol": "A1BG", "ensembl_protein_id": "ENSP00000263100.2"
+    }
+    assert parse_entry(["A1BG", "not-an-id"], "proteomics") == {"gene_id": "A1BG", "gene_symbol": "A1BG"}
+    assert parse_entry(["", "ENSP00000263100.2"], "proteomics") is None
+
+
+def test_populate_mapping_table_batches_with_on_conflict(mock_session):
+    """
+    Test that each batch is one INSERT .. ON CONFLICT DO NOTHING over uniform rows, and that
+    entries without a gene symbol are skipped.
+    """
+    data_by_source = {"umich": [
+        ["A1BG", "ENSP00000263100.2"],
+        ["", "ENSP00000323929.3"],  # Missing gene symbol
+        ["A1BG", "ENSP00000263100.2"],  # Duplicate; left to ON CONFLICT DO NOTHING
+        ["A2M", "ENSP00000323929.3"],
+        ["NAT2", "ENSP00000286479.3"],
+    ]}
+
+    populate_mapping_table(data_by_source, "proteomics", batch_size=2)
+
+    batches = [call.args[1] for call in mock_session.execute.call_args_list]
+    assert [[row["gene_symbol"] for row in rows] for rows in batches] == [["A1BG"], ["A1BG", "A2M"], ["NAT2"]]
+    # Every row carries the same keys so each batch runs as a single executemany
+    assert all(row.keys() == batches[0][0].keys() for rows in batches for row in rows)
+    assert set(MAPPING_ROW_DEFAULTS) <= set(batches[0][0])
+    assert batches[0][0]["ensembl_gene_id"] is None
+
+    statement = mock_session.execute.call_args_list[0].args[0]
+    assert "ON CONFLICT DO NOTHING" in str(statement.compile(dialect=postgresql.dialect()))
+    assert mock_session.commit.call_count == 3
+
+
+def test_populate_mapping_table_skips_insert_for_empty_batch(mock_session):
+    """
+    Test that a batch whose entries are all skipped issues no INSERT.
+    """
+    populate_mapping_table({"umich": [["", "ENSP00000263100.2"]]}, "proteomics")
+
+    mock_session.execute.assert_not_called()
+    mock_session.commit.assert_called_once()